@@ -128,7 +128,7 @@ def cluster_size_diff_stripped(reference_graph: BaseGraph, graph: BaseGraph, par
     ref_cluster_sizes = []
     g_clusters_sizes = sorted(graph.get_community_sizes(), reverse=True)
 
-    not_added_nodes = set(reference_graph.G.nodes()) - set(graph.G.nodes())
+    not_added_nodes = set(reference_graph.get_nodes()) - set(graph.get_nodes())
 
     for k, v in reference_graph.get_community_nodes().items():
         ref_cluster_sizes.append(len(v) - len(set(v).intersection(not_added_nodes)))
@@ -310,7 +310,7 @@ def stripped_entropy(reference_graph: BaseGraph, graph: BaseGraph, params: dict)
         :return float: the stripped entropy of the reference graph
     """
     ref_cluster_sizes = []
-    not_added_nodes = set(reference_graph.G.nodes()) - set(graph.G.nodes())
+    not_added_nodes = set(reference_graph.get_nodes()) - set(graph.get_nodes())
 
     for k, v in reference_graph.get_community_nodes().items():
         ref_cluster_sizes.append(len(v) - len(set(v).intersection(not_added_nodes)))
@@ -328,7 +328,7 @@ def stripped_entropy_normalized(reference_graph: BaseGraph, graph: BaseGraph, pa
         :return float: the stripped entropy of the reference graph
     """
     ref_cluster_sizes = []
-    not_added_nodes = set(reference_graph.G.nodes()) - set(graph.G.nodes())
+    not_added_nodes = set(reference_graph.get_nodes()) - set(graph.get_nodes())
 
     for k, v in reference_graph.get_community_nodes().items():
         ref_cluster_sizes.append(len(v) - len(set(v).intersection(not_added_nodes)))
@@ -48,7 +48,7 @@ def entropy_approximation(graph: BaseGraph, params: dict) -> float:
     node_num_edges_over_threshold = Counter([node for k, v in graph.get_weight_edge().items() if k >= threshold for t in v for node in t])
 
     s_sum = 0
-    for i in graph.G.nodes():
+    for i in graph.get_nodes():
         s_sum += np.log2((1 + node_num_edges_over_threshold.get(i, 0)) / num_nodes)
 
     return -(s_sum / num_nodes)
@@ -70,7 +70,7 @@ def entropy_approximation_normalized(graph: BaseGraph, params: dict) -> float:
     node_num_edges_over_threshold = Counter([node for k, v in graph.get_weight_edge().items() if k >= threshold for t in v for node in t])
 
     s_sum = 0
-    for i in graph.G.nodes():
+    for i in graph.get_nodes():
         s_sum += np.log2((1 + node_num_edges_over_threshold.get(i, 0)) / num_nodes)
 
     h = -(s_sum / num_nodes)
@@ -101,8 +101,9 @@ def apd(graph: BaseGraph, params: dict) -> float:
     sample_size = params.get('sample_size', 100)
     sampled_edge_list = []
 
+    nodes = list(graph.get_nodes())
     for _ in range(sample_size):
-        u, v = sorted(random.sample(graph.G.nodes(), 2))
+        u, v = sorted(random.sample(nodes, 2))
         if graph.get_edge(u, v) is not None:
             sampled_edge_list.append(graph.get_edge(u, v))
 
@@ -138,8 +139,9 @@ def hpd(graph: BaseGraph, params: dict) -> float:
     sample_size = params.get('sample_size', 100)
     sampled_edge_list = []
 
+    nodes = list(graph.get_nodes())
     for _ in range(sample_size):
-        u, v = sorted(random.sample(graph.G.nodes(), 2))
+        u, v = sorted(random.sample(nodes, 2))
         if graph.get_edge(u, v) is not None:
             sampled_edge_list.append(graph.get_edge(u, v))
 
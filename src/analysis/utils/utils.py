@@ -1,5 +1,4 @@
 import os
-import pickle
 import numpy as np
 from graphs.base_graph import BaseGraph
 
@@ -11,9 +10,7 @@ def load_graph_from_path_file(path_list: list):
     for _ in it:
         path = _pl[it.multi_index]
 
-        with open(path, 'rb') as file:
-            _graphs[it.multi_index] = pickle.load(file)
-        file.close()
+        _graphs[it.multi_index] = BaseGraph.load_graph(path)
     return _graphs
 
 
@@ -28,9 +25,7 @@ def load_graph_from_path_dir(path_list: list, suffix, sort_func, shape):
         for _, _, files in os.walk(path):
             for file in files:
                 if file.endswith(suffix):
-                    with open('{}/{}'.format(path, file), 'rb') as fg:
-                        graphs.append(pickle.load(fg))
-                    fg.close()
+                    graphs.append(BaseGraph.load_graph('{}/{}'.format(path, file)))
         graphs.sort(key=sort_func)
         if len(graphs) != shape[-1]:
             graphs.extend([graphs[-1]] * (shape[-1] - len(graphs)))
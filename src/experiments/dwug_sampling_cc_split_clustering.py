@@ -1,6 +1,5 @@
 import os
 import sys
-import pickle
 import numpy as np
 import csv
 import traceback
@@ -47,11 +46,11 @@ def dwug_sim(graph_path: str, rounds: int, annotations_per_edge: int):
     name: str
     path: str
     for i, (name, path) in enumerate(paths_to_true):
+        # the true graph is only read, hence loaded once (memory-mapped, shared with parallel runs on the same graph)
+        graph: BaseGraph = BaseGraph.load_graph(path, mmap=True)
+
         for _round in range(rounds):
             print("Graph {}: Round: {}".format(name, _round + 1))
-            with open(path, 'rb') as file:
-                graph: BaseGraph = pickle.load(file)
-            file.close()
 
             annotated_graph = AnnotatedGraph(graph.get_number_nodes())
 
@@ -1,6 +1,5 @@
 import os
 import sys
-import pickle
 import numpy as np
 import csv
 import traceback
@@ -49,14 +48,12 @@ def modifiedrandomwalk_sim(graph_path: str, rounds: int, annotations_per_edge: i
     for i, (name, path) in enumerate(paths_to_true):
         for _round in range(rounds):
             print("Graph {}: Round: {}".format(name, _round + 1))
-            with open(path, 'rb') as file:
-                graph: BaseGraph = pickle.load(file)
-            file.close()
+            graph: BaseGraph = BaseGraph.load_graph(path)
 
             annotated_graph = AnnotatedGraph(graph.get_number_nodes())
 
             # Sampler/s
-            sampling_step = Sampling(annotations_per_edge=annotations_per_edge).add_sampling_strategie(modified_randomwalk, {'sample_size': int(10 / annotations_per_edge), 'start': annotated_graph.get_last_added_node, 'conntained_func': annotated_graph.G.nodes})\
+            sampling_step = Sampling(annotations_per_edge=annotations_per_edge).add_sampling_strategie(modified_randomwalk, {'sample_size': int(10 / annotations_per_edge), 'start': annotated_graph.get_last_added_node, 'conntained_func': annotated_graph.get_nodes})\
                 .add_annotator(Annotator().add_error_sampling(np.random.poisson, dict(lam=0.35), 1, 4, 0.5).add_zero_probability(1 / 30))\
                 .add_annotator(Annotator().add_error_sampling(np.random.poisson, dict(lam=0.35), 1, 4, 0.5).add_zero_probability(1 / 30))\
                 .add_annotator(Annotator().add_error_sampling(np.random.poisson, dict(lam=0.35), 1, 4, 0.5).add_zero_probability(1 / 30))\
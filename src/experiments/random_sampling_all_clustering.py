@@ -1,6 +1,5 @@
 import os
 import sys
-import pickle
 import numpy as np
 import csv
 import traceback
@@ -49,9 +48,7 @@ def randomsampling_sim(graph_path: str, rounds: int, annotations_per_edge: int):
     for i, (name, path) in enumerate(paths_to_true):
         for _round in range(rounds):
             print("Graph {}: Round: {}".format(name, _round + 1))
-            with open(path, 'rb') as file:
-                graph: BaseGraph = pickle.load(file)
-            file.close()
+            graph: BaseGraph = BaseGraph.load_graph(path)
 
             annotated_graph = AnnotatedGraph(graph.get_number_nodes())
 
@@ -0,0 +1,194 @@
+import numpy as np
+
+from multiprocessing import shared_memory
+
+from graphs.base_graph import BaseGraph
+from graphs.utils.util import build_edge_dicts
+
+
+class AdjacencyGraph(BaseGraph):
+    """
+    Base for true graphs, whose complete, weighted edge set is given by an adjacency matrix.
+    Subclasses have to set :adjacency_matrix: and :labels: and then call :_build_nx_graph_rep:.
+
+    In lazy mode only the adjacency matrix (in its most compact integer type) and the labels are kept.
+        The nx.Graph edges, edge-weight and weight-edges dicts are only build, when they are requested for the first time.
+        Nodes and community dicts are always available.
+
+    The adjacency matrix can be shared read-only between processes,
+        either memory-mapped from a binary graph file (load_graph(path, mmap=True)) or placed in shared memory (:share_adjacency_matrix:).
+    """
+
+    # graphs pickled before the lazy mode existed are always fully build
+    _lazy = False
+    _materialized = True
+    _shared_memory = None
+    _shared_memory_owner = False
+
+    def __init__(self, lazy: bool = False):
+        super().__init__()
+
+        self.adjacency_matrix: np.ndarray = None
+        self._lazy = lazy
+        self._materialized = False
+
+    def get_edge(self, u_node: int, v_node: int, **params) -> int:
+        return int(self.adjacency_matrix[u_node, v_node])
+
+    def get_edges(self, u_nodes, v_nodes, **params) -> np.ndarray:
+        return self.adjacency_matrix[np.asarray(u_nodes, dtype=np.intp), np.asarray(v_nodes, dtype=np.intp)].astype(np.int64)
+
+    def get_nodes(self):
+        return range(len(self.adjacency_matrix))
+
+    def get_number_edges(self) -> int:
+        # complete graph
+        return len(self.adjacency_matrix) * (len(self.adjacency_matrix) - 1) // 2
+
+    def share_adjacency_matrix(self) -> shared_memory.SharedMemory:
+        """
+        Moves the adjacency matrix into a read-only shared memory block.
+            Pickled copies of this graph (e.g. send to worker processes) attach to the block, instead of copying the matrix.
+            The block is freed by :release_adjacency_matrix: of this graph, after all workers are done,
+            closing or unlinking the returned block directly would leave the adjacency matrix pointing into freed memory.
+
+        Args:
+            :return SharedMemory: the shared memory block
+        """
+        if self._shared_memory is not None:
+            return self._shared_memory
+
+        block = shared_memory.SharedMemory(create=True, size=max(self.adjacency_matrix.nbytes, 1))
+        adjacency_matrix = np.ndarray(self.adjacency_matrix.shape, dtype=self.adjacency_matrix.dtype, buffer=block.buf)
+        adjacency_matrix[:] = self.adjacency_matrix
+        adjacency_matrix.flags.writeable = False
+
+        self.adjacency_matrix = adjacency_matrix
+        self._shared_memory = block
+        self._shared_memory_owner = True
+        return block
+
+    def release_adjacency_matrix(self) -> None:
+        """
+        Copies a shared adjacency matrix back into the memory of this process and closes its shared memory block.
+            The graph, which shared the matrix, also unlinks (frees) the block, thus it has to be released last.
+            Attached copies (in worker processes) close the block on release or when they are garbage collected.
+        """
+        if self._shared_memory is None:
+            return
+
+        block = self._shared_memory
+        self.adjacency_matrix = np.array(self.adjacency_matrix)
+        self._shared_memory = None
+
+        block.close()
+        if self._shared_memory_owner:
+            block.unlink()
+            self._shared_memory_owner = False
+
+    def _materialize(self) -> None:
+        if not self._materialized:
+            self._build_edge_rep()
+
+    def _build_nx_graph_rep(self) -> None:
+        """
+        Builds the nodes & community dicts and, if not lazy, the edges & edge dicts of the nx.Graph.
+        """
+        self._build_community_rep()
+
+        if self._lazy:
+            self._compact_adjacency_matrix()
+        else:
+            self._build_edge_rep()
+
+    def _build_community_rep(self) -> None:
+        # ===Calculation Phase===
+        # community-node dict
+        community_nodes = {}
+        node_community = {}
+        for node_id, label in enumerate(self.labels):
+            if community_nodes.get(label, None) is None:
+                community_nodes[label] = []
+            community_nodes[label].append(node_id)
+            node_community[node_id] = label
+        # ===Calculation Phase END===
+
+        # ===Build Phase===
+        self._G.add_nodes_from(range(len(self.adjacency_matrix)))
+
+        self._G.graph['community_nodes'] = community_nodes
+        self._G.graph['node_community'] = node_community
+        # ===Build Phase===
+
+    def _build_edge_rep(self) -> None:
+        # ===Calculation Phase===
+        # Builds weighted edge list, edge-weight dict, and weight-edges dict
+        edge_list, edge_weight, weight_edge = build_edge_dicts(self.adjacency_matrix)
+        # ===Calculation Phase END===
+
+        # ===Build Phase===
+        self._G.add_weighted_edges_from(edge_list)
+
+        # save edge/weight dicts
+        self._G.graph['edge_weight'] = edge_weight
+        self._G.graph['weight_edge'] = weight_edge
+        # ===Build Phase===
+
+        self._materialized = True
+
+    def _serialize(self) -> (dict, dict, dict):
+        # edges and community dicts are rebuild from the adjacency matrix and labels
+        objects = self._serialize_objects(('adjacency_matrix', 'labels', '_lazy', '_materialized', '_shared_memory', '_shared_memory_owner'),
+                                          ('community_nodes', 'node_community', 'edge_weight', 'weight_edge', 'edge_soft_weight', 'weight_edge_position', 'edge_weight_history'))
+        return {'lazy': self._lazy}, objects, {'adjacency_matrix': self.adjacency_matrix, 'labels': np.asarray(self.labels)}
+
+    @classmethod
+    def _deserialize(cls, attributes: dict, objects: dict, arrays: dict, lazy: bool = None, **params):
+        """
+        Loaded graphs always build their edges on first request, as in lazy mode.
+
+        Args:
+            :param lazy: overrides the saved lazy mode (compacting the adjacency matrix, unless memory-mapped)
+        """
+        graph = cls.__new__(cls)
+        AdjacencyGraph.__init__(graph, attributes['lazy'] if lazy is None else lazy)
+
+        graph.adjacency_matrix, graph.labels = arrays['adjacency_matrix'], arrays['labels']
+        graph.__dict__.update(objects['attributes'])
+
+        graph._build_community_rep()
+        # a memory-mapped matrix is kept as saved, compacting it would copy it into memory
+        if graph._lazy and not isinstance(graph.adjacency_matrix, np.memmap):
+            graph._compact_adjacency_matrix()
+        graph._G.graph.update(objects['graph'])
+
+        return graph
+
+    def __getstate__(self) -> dict:
+        state = super().__getstate__()
+
+        # a shared adjacency matrix is pickled as reference to its shared memory block
+        if self._shared_memory is not None:
+            state['adjacency_matrix'] = (self.adjacency_matrix.shape, self.adjacency_matrix.dtype.str)
+            state['_shared_memory'] = self._shared_memory.name
+        # only the sharing graph frees the block
+        state.pop('_shared_memory_owner', None)
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        if state.get('_shared_memory', None) is not None:
+            block = shared_memory.SharedMemory(name=state['_shared_memory'])
+            shape, dtype = state['adjacency_matrix']
+            state['adjacency_matrix'] = np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf)
+            state['adjacency_matrix'].flags.writeable = False
+            state['_shared_memory'] = block
+        super().__setstate__(state)
+
+    def _compact_adjacency_matrix(self) -> None:
+        """
+        Stores integer weights in the smallest fitting integer type (usually uint8 instead of float64).
+        """
+        if self.adjacency_matrix.size == 0 or not np.array_equal(self.adjacency_matrix, np.trunc(self.adjacency_matrix)):
+            return
+        dtype = np.promote_types(np.min_scalar_type(int(self.adjacency_matrix.min())), np.min_scalar_type(int(self.adjacency_matrix.max())))
+        self.adjacency_matrix = self.adjacency_matrix.astype(dtype)
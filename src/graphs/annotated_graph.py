@@ -3,14 +3,28 @@ import numpy as np
 
 from graphs.base_graph import BaseGraph
 
+# judgements are counted per edge in a vector of this (initial) length: 0 (no judgement) to 4
+_JUDGEMENT_LEVELS = 5
+# initial number of edge slots, grows by doubling
+_INITIAL_EDGE_CAPACITY = 64
+
 
 class AnnotatedGraph(BaseGraph):
 
+    _edge_data_attributes = BaseGraph._edge_data_attributes + \
+        ('_node_present', '_edge_slot', '_edge_keys', '_edge_counts', '_edge_weights', '_weight_positions', '_edge_order', '_unsynced_slots', '_cluster_links')
+
     def __init__(self, max_nodes: int):
         """
         Simulated WUG.
         Used for simulating the annotation process of word usages.
 
+        Nodes, labels and edges are kept in preallocated numpy arrays.
+            Each edge has a slot in the edge arrays, found through its packed key u * max_nodes + v.
+            The edges and edge-weight dicts of the nx.Graph are only build, when :G: is accessed,
+            clustering uses :get_nx_graph_copy:, which is build from the arrays directly.
+        The number of edges between each node and community is indexed, rebuild on the first request after the clustering changed.
+
         Args:
             :param max_nodes: nodes in the sampled WUG
         """
@@ -18,18 +32,44 @@ class AnnotatedGraph(BaseGraph):
 
         # Max number of nodes
         self._max_nodes = max_nodes
-        # -1 means, node not currently in the graph
-        self.labels = [-1] * self._max_nodes
+        self._init_storage()
 
         # last node added & judgements
         self.last_edge = None
         self.judgements = 0
 
-        # differently weighted edges. Need to be addressed through params in functions
-        self.G.graph['edge_soft_weight'] = {}  # only important for wug
-        self.G.graph['edge_added_weights'] = {}  # only important for wug
+        # positions in the weight-edges dict are stored in the edge slots
+        del self._G.graph['weight_edge_position']
 
-        self.G.graph['distribution'] = 'simulated'  # only important for wug
+        self._G.graph['distribution'] = 'simulated'  # only important for wug
+
+    def _init_storage(self) -> None:
+        # -1 means, node not currently in the graph
+        self.labels = np.full(self._max_nodes, -1, dtype=np.int64)
+        self._node_present = np.zeros(self._max_nodes, dtype=bool)
+
+        # packed edge key -> slot in the edge arrays
+        self._edge_slot = {}
+        self._num_edge_slots = 0
+        # number of edges with a weight (not only zero judgements)
+        self._num_edges = 0
+
+        self._edge_keys = np.zeros(_INITIAL_EDGE_CAPACITY, dtype=np.int64)
+        # per edge count vector of the added judgements, index = judgement (0 = no judgement)
+        self._edge_counts = np.zeros((_INITIAL_EDGE_CAPACITY, _JUDGEMENT_LEVELS), dtype=np.int32)
+        # median of the judgements, nan = only zero judgements
+        self._edge_weights = np.full(_INITIAL_EDGE_CAPACITY, np.nan)
+        # position of the edge in its weight_edge list
+        self._weight_positions = np.zeros(_INITIAL_EDGE_CAPACITY, dtype=np.int64)
+        # order in which the edges got their first weight (their order in the nx.Graphs)
+        self._edge_order = np.zeros(_INITIAL_EDGE_CAPACITY, dtype=np.int64)
+
+        # slots, whose weight changed since the nx.Graph was last build
+        self._unsynced_slots = set()
+
+        # packed node * stride + community -> number of edges between them, None = has to be rebuild
+        self._cluster_links = None
+        self._cluster_link_stride = 0
 
     def get_edge(self, u_node: int, v_node: int, **params) -> float or None:
         """
@@ -41,13 +81,19 @@ class AnnotatedGraph(BaseGraph):
             :return float: weight
         """
         u, v = sorted([u_node, v_node])
-        weight = self.G.graph['edge_added_weights'].get((u, v), None)
 
-        if weight is None:
+        # nodes out of range have no edges (and their packed key could collide with another edge)
+        if not 0 <= u <= v < self._max_nodes:
+            return None
+
+        slot = self._edge_slot.get(self._pack_edge(u, v), None)
+
+        if slot is None:
             return None
 
-        weight = np.nanmedian(weight)
-        return 0 if np.isnan(weight) else weight
+        # only zero judgements (median is nan)
+        weight = self._edge_weights[slot]
+        return 0 if np.isnan(weight) else float(weight)
 
     def add_edge(self, node_u: int, node_v: int, weight: float, **params) -> None:
         """
@@ -60,43 +106,211 @@ class AnnotatedGraph(BaseGraph):
             :param weight: weight
         """
         u, v = sorted([node_u, node_v])
-        nweight = weight if weight != 0 else np.nan
+        self._check_edge_nodes(u, v)
+        judgement = _judgement_level(weight)
+        self._mutated()
 
-        if self.G.graph['edge_added_weights'].get((u, v), None) is None:
-            self.G.graph['edge_added_weights'][(u, v)] = []
-        self.G.graph['edge_added_weights'][(u, v)].append(nweight)
+        slot = self._edge_slot.get(self._pack_edge(u, v), None)
+        if slot is None:
+            slot = self._add_edge_slot(u, v)
+        if judgement >= self._edge_counts.shape[1]:
+            self._grow_judgement_levels(judgement + 1)
+        self._edge_counts[slot, judgement] += 1
 
-        weight_to_add = np.nanmedian(self.G.graph['edge_added_weights'].get((u, v), [nweight]))
+        self.last_edge = [int(node_u), int(node_v)]
+        self.judgements += 1
 
-        if np.isnan(weight_to_add):
-            self.last_edge = [int(node_u), int(node_v)]
-            self.judgements += 1
-            return
+        weight_to_add = _count_median(self._edge_counts[slot].tolist())
+        old_weight = self._edge_weights[slot]
 
-        self.G.add_weighted_edges_from([(u, v, weight_to_add)])
+        if weight_to_add is None or weight_to_add == old_weight:
+            return
 
-        self.G.graph['edge_weight'][(u, v)] = weight_to_add
-        self.G.graph['edge_soft_weight'][(u, v)] = weight_to_add - 2.5
+        if np.isnan(old_weight):
+            old_weight = None
+            self._edge_order[slot] = self._num_edges
+            self._num_edges += 1
+            self._add_node(u)
+            self._add_node(v)
+        else:
+            old_weight = float(old_weight)
 
-        if self.G.graph['weight_edge'].get(weight_to_add, None) is None:
-            self.G.graph['weight_edge'][weight_to_add] = []
-        self.G.graph['weight_edge'][weight_to_add].append((u, v))
+        self._move_edge_weight((u, v), old_weight, weight_to_add)
+        self._edge_weights[slot] = weight_to_add
+        self._unsynced_slots.add(slot)
 
-        self.last_edge = [int(node_u), int(node_v)]
-        self.judgements += 1
+    def add_edges_from_arrays(self, u_nodes: np.ndarray, v_nodes: np.ndarray, weights: np.ndarray, **params) -> None:
+        """
+        Adds a batch of judgements to the graph, with the same result as adding them one by one.
+        Judgements on the same edge are aggregated and every edge and index is only updated once per batch.
 
-    def add_edges(self, edge_list: list, **params) -> None:
+        Args:
+            :param u_nodes: first node of each judgement
+            :param v_nodes: second node of each judgement
+            :param weights: judgements
         """
-        Adds an list of edges to the graph.
+        u_nodes = np.asarray(u_nodes, dtype=np.int64)
+        v_nodes = np.asarray(v_nodes, dtype=np.int64)
+        weights = np.asarray(weights, dtype=float)
+
+        # ===Guard Phase===
+        if not len(u_nodes) == len(v_nodes) == len(weights):
+            raise ValueError('Nodes and weights have to be of the same length')
+
+        if len(weights) == 0:
+            return
+
+        # packed keys are only unique for nodes in [0, max_nodes)
+        if np.any((u_nodes < 0) | (u_nodes >= self._max_nodes) | (v_nodes < 0) | (v_nodes >= self._max_nodes)):
+            raise ValueError('Nodes have to be in [0, {})'.format(self._max_nodes))
+
+        judgements = _judgement_levels(weights)
+        # ===Guard Phase End===
+
+        self._mutated()
+
+        u, v = np.minimum(u_nodes, v_nodes), np.maximum(u_nodes, v_nodes)
+        unique_keys, first_index, inverse = np.unique(self._pack_edge(u, v), return_index=True, return_inverse=True)
+        unique_u, unique_v = u[first_index].tolist(), v[first_index].tolist()
+
+        # ===Slot Phase===
+        # new edges get their slots in order of their first judgement
+        unique_slots = np.array([self._edge_slot.get(key, -1) for key in unique_keys.tolist()], dtype=np.int64)
+        for k in sorted(np.flatnonzero(unique_slots < 0).tolist(), key=first_index.__getitem__):
+            unique_slots[k] = self._add_edge_slot(unique_u[k], unique_v[k])
+
+        if judgements.max() >= self._edge_counts.shape[1]:
+            self._grow_judgement_levels(int(judgements.max()) + 1)
+        np.add.at(self._edge_counts, (unique_slots[inverse], judgements), 1)
+        # ===Slot Phase End===
+
+        self.last_edge = [int(u_nodes[-1]), int(v_nodes[-1])]
+        self.judgements += len(weights)
+
+        # ===Weight Phase===
+        old_weights = self._edge_weights[unique_slots]
+        new_weights = _count_medians(self._edge_counts[unique_slots])
+        changed = np.flatnonzero(~np.isnan(new_weights) & (new_weights != old_weights))
+
+        # edges get their first weight with their first non-zero judgement
+        non_zero = np.flatnonzero(judgements > 0)
+        first_weighted = np.full(len(unique_keys), len(weights), dtype=np.int64)
+        np.minimum.at(first_weighted, inverse[non_zero], non_zero)
+        changed = changed[np.argsort(first_weighted[changed], kind='stable')]
+
+        for k, old_weight, new_weight in zip(changed.tolist(), old_weights[changed].tolist(), new_weights[changed].tolist()):
+            if np.isnan(old_weight):
+                old_weight = None
+                self._edge_order[unique_slots[k]] = self._num_edges
+                self._num_edges += 1
+                self._add_node(unique_u[k])
+                self._add_node(unique_v[k])
+
+            self._move_edge_weight((unique_u[k], unique_v[k]), old_weight, new_weight)
+
+        self._edge_weights[unique_slots[changed]] = new_weights[changed]
+        self._unsynced_slots.update(unique_slots[changed].tolist())
+        # ===Weight Phase End===
+
+    def _pack_edge(self, u_node: int, v_node: int) -> int:
+        return u_node * self._max_nodes + v_node
+
+    def _check_edge_nodes(self, u_node: int, v_node: int) -> None:
+        # packed keys are only unique for nodes in [0, max_nodes)
+        if not 0 <= u_node <= v_node < self._max_nodes:
+            raise ValueError('Nodes have to be in [0, {}), got ({}, {})'.format(self._max_nodes, u_node, v_node))
+
+    def _add_edge_slot(self, u_node: int, v_node: int) -> int:
+        # ===Guard Phase===
+        self._check_edge_nodes(u_node, v_node)
+        # ===Guard Phase End===
+
+        slot = self._num_edge_slots
+        if slot == len(self._edge_keys):
+            self._grow_edge_slots(2 * slot)
+
+        key = self._pack_edge(u_node, v_node)
+        self._edge_keys[slot] = key
+        self._edge_slot[key] = slot
+        self._num_edge_slots += 1
+
+        if self._cluster_links is not None:
+            for node, other_node in ((u_node, v_node), (v_node, u_node)):
+                if self.labels[other_node] >= 0:
+                    link = node * self._cluster_link_stride + int(self.labels[other_node])
+                    self._cluster_links[link] = self._cluster_links.get(link, 0) + 1
+
+        return slot
+
+    def _grow_edge_slots(self, capacity: int) -> None:
+        grow = capacity - len(self._edge_keys)
+        self._edge_keys = np.concatenate((self._edge_keys, np.zeros(grow, dtype=np.int64)))
+        self._edge_counts = np.concatenate((self._edge_counts, np.zeros((grow, self._edge_counts.shape[1]), dtype=np.int32)))
+        self._edge_weights = np.concatenate((self._edge_weights, np.full(grow, np.nan)))
+        self._weight_positions = np.concatenate((self._weight_positions, np.zeros(grow, dtype=np.int64)))
+        self._edge_order = np.concatenate((self._edge_order, np.zeros(grow, dtype=np.int64)))
+
+    def _grow_judgement_levels(self, levels: int) -> None:
+        grow = levels - self._edge_counts.shape[1]
+        self._edge_counts = np.concatenate((self._edge_counts, np.zeros((len(self._edge_counts), grow), dtype=np.int32)), axis=1)
+
+    def _add_node(self, node: int) -> None:
+        if not self._node_present[node]:
+            self._node_present[node] = True
+            self._G.add_node(node)
+
+    def _move_edge_weight(self, edge: tuple, old_weight: float or None, new_weight: float) -> None:
+        # same as in BaseGraph, but the positions are stored in the edge slots
+        if old_weight == new_weight:
+            return
+
+        weight_edge = self._G.graph['weight_edge']
+        slot = self._edge_slot[self._pack_edge(*edge)]
+
+        if old_weight is not None:
+            edges = weight_edge[old_weight]
+            index = self._weight_positions[slot]
+
+            last_edge = edges.pop()
+            if index < len(edges):
+                edges[index] = last_edge
+                self._weight_positions[self._edge_slot[self._pack_edge(*last_edge)]] = index
+
+            if len(edges) == 0:
+                del weight_edge[old_weight]
 
-        Expected input of list:
-            [(node1: int, node2:int, weight: float), ...]
+        if weight_edge.get(new_weight, None) is None:
+            weight_edge[new_weight] = []
+        self._weight_positions[slot] = len(weight_edge[new_weight])
+        weight_edge[new_weight].append(edge)
+
+    def _weighted_edges(self) -> (np.ndarray, np.ndarray, np.ndarray):
+        """
+        Returns the edges with a weight, in order of their first weight.
 
         Args:
-            :param edge_list: edges to add
+            :return (u, v, weight): arrays of the edges nodes and weights
         """
-        for edge in edge_list:
-            self.add_edge(*edge)
+        slots = np.flatnonzero(~np.isnan(self._edge_weights[:self._num_edge_slots]))
+        slots = slots[np.argsort(self._edge_order[slots], kind='stable')]
+        u, v = np.divmod(self._edge_keys[slots], self._max_nodes)
+        return u, v, self._edge_weights[slots]
+
+    def _materialize(self) -> None:
+        if len(self._unsynced_slots) == 0:
+            return
+
+        slots = np.array(list(self._unsynced_slots), dtype=np.int64)
+        slots = slots[np.argsort(self._edge_order[slots], kind='stable')]
+        u, v = np.divmod(self._edge_keys[slots], self._max_nodes)
+        edges = list(zip(u.tolist(), v.tolist()))
+        weights = self._edge_weights[slots].tolist()
+
+        self._G.add_weighted_edges_from(zip(u.tolist(), v.tolist(), weights))
+        self._G.graph['edge_weight'].update(zip(edges, weights))
+        self._G.graph['edge_soft_weight'].update(zip(edges, (self._edge_weights[slots] - 2.5).tolist()))
+
+        self._unsynced_slots = set()
 
     def get_last_added_edge(self):
         return self.last_edge
@@ -109,35 +323,66 @@ class AnnotatedGraph(BaseGraph):
     def get_num_added_edges(self) -> int:
         return self.judgements
 
-    def get_weight_edge(self) -> dict:
-        edge_weights = self.G.graph['edge_added_weights']
-
-        weights_edges = dict()
-        for k, v in edge_weights.items():
-            ac_weight = np.nanmedian(v)
-            if weights_edges.get(ac_weight, None) is None:
-                weights_edges[ac_weight] = []
-            weights_edges[ac_weight].append(k)
-
-        return weights_edges
+    def get_number_edges(self) -> int:
+        return self._num_edges
 
     def get_nx_graph_copy(self, weight: str = '', fmap=lambda x: x) -> nx.Graph:
         """
-        Creates a new nx.Graph with specified weight dict.
+        Returns a nx.Graph with specified weight dict, see BaseGraph.get_nx_graph_copy (cached and frozen).
+        The edge-weight and soft edge-weight graphs are build from the edge arrays, without materializing :G:.
 
         Args:
             :param weight: which weight dict to use to populate the nx.Graphs edges
         """
-        weights = self.G.graph.get(weight, None)
-        assert type(weights) == dict or weights is None
+        return super().get_nx_graph_copy(weight, fmap)
+
+    def is_node_connected_to_cluster(self, node: int, community) -> bool:
+        """
+        Checks, if the node has an edge (of any judgement) to any node of the community, in O(1).
+
+        Args:
+            :param node: node
+            :param community: key of the community in the community-nodes dict
+            :return bool: if connected
+        """
+        if self._cluster_links is None:
+            self._build_cluster_links()
+
+        if not 0 <= community < self._cluster_link_stride:
+            return False
+        return self._cluster_links.get(node * self._cluster_link_stride + community, 0) > 0
+
+    def _build_cluster_links(self) -> None:
+        u, v = np.divmod(self._edge_keys[:self._num_edge_slots], self._max_nodes)
+
+        # each edge links both of its nodes to the community of the other one
+        nodes = np.concatenate((u, v))
+        communities = np.concatenate((self.labels[v], self.labels[u]))
+        clustered = communities >= 0
 
+        self._cluster_link_stride = int(self.labels.max()) + 1 if len(self.labels) > 0 else 0
+        links, counts = np.unique(nodes[clustered] * self._cluster_link_stride + communities[clustered], return_counts=True)
+        self._cluster_links = dict(zip(links.tolist(), counts.tolist()))
+
+    def _build_nx_graph_copy(self, weight: str, fmap) -> nx.Graph:
         graph = nx.Graph()
 
-        if weights is not None:
+        if weight not in ['edge_weight', 'edge_soft_weight'] and weight in self._G.graph:
+            # weight dicts added through add_new_weight_dict
+            weights = self.G.graph[weight]
+            assert type(weights) == dict
             graph.add_weighted_edges_from(list(map(lambda k: (*k[0], k[1]), weights.items())))
+            return graph
+
+        u, v, weights = self._weighted_edges()
+
+        if weight == 'edge_weight':
+            graph.add_weighted_edges_from(zip(u.tolist(), v.tolist(), weights.tolist()))
+        elif weight == 'edge_soft_weight':
+            graph.add_weighted_edges_from(zip(u.tolist(), v.tolist(), (weights - 2.5).tolist()))
         else:
             assert callable(fmap)
-            graph.add_weighted_edges_from(list(map(lambda k: (*k[0], fmap(k[1])), self.G.graph['edge_weight'].items())))
+            graph.add_weighted_edges_from(zip(u.tolist(), v.tolist(), map(fmap, weights.tolist())))
 
         return graph
 
@@ -151,10 +396,177 @@ class AnnotatedGraph(BaseGraph):
         super().update_community_nodes_membership(new_community_nodes)
 
         # -1 resembles that this node is not yet in the graph
-        for k, v in self.G.graph['community_nodes'].items():
-            for node in v:
-                self.labels[node] = k
+        for k, v in self._G.graph['community_nodes'].items():
+            self.labels[np.asarray(v, dtype=np.int64)] = k
+
+        self._cluster_links = None
+
+    def _serialize(self) -> (dict, dict, dict):
+        # the weight-edges dict is rebuild, the nx.Graph edges and edge-weight dicts are synced on access of G
+        objects = self._serialize_objects(('labels', 'judgements', 'last_edge', '_max_nodes', '_num_edge_slots', '_num_edges'),
+                                          ('edge_weight', 'weight_edge', 'edge_soft_weight'))
+
+        slots = self._num_edge_slots
+        arrays = {'labels': self.labels,
+                  'nodes': np.fromiter(self._G.nodes(), dtype=np.int64, count=self.get_number_nodes()),
+                  'edge_keys': self._edge_keys[:slots],
+                  'edge_counts': self._edge_counts[:slots],
+                  'edge_weights': self._edge_weights[:slots],
+                  'edge_order': self._edge_order[:slots]}
+
+        return {'max_nodes': self._max_nodes, 'judgements': self.judgements, 'last_edge': self.last_edge}, objects, arrays
+
+    @classmethod
+    def _deserialize(cls, attributes: dict, objects: dict, arrays: dict, **params):
+        graph = cls(attributes['max_nodes'])
+        graph.judgements, graph.last_edge = attributes['judgements'], attributes['last_edge']
+        graph.labels[:] = arrays['labels']
+
+        # ===Edge Phase===
+        slots, levels = arrays['edge_counts'].shape
+        if slots > len(graph._edge_keys):
+            graph._grow_edge_slots(slots)
+        if levels > graph._edge_counts.shape[1]:
+            graph._grow_judgement_levels(levels)
+
+        graph._edge_keys[:slots] = arrays['edge_keys']
+        graph._edge_counts[:slots, :levels] = arrays['edge_counts']
+        graph._edge_weights[:slots] = arrays['edge_weights']
+        graph._edge_order[:slots] = arrays['edge_order']
+        graph._edge_slot = dict(zip(arrays['edge_keys'].tolist(), range(slots)))
+        graph._num_edge_slots = slots
+        # ===Edge Phase End===
+
+        # ===Node & Index Phase===
+        graph._node_present[arrays['nodes']] = True
+        graph._G.add_nodes_from(arrays['nodes'].tolist())
+
+        weighted = np.flatnonzero(~np.isnan(graph._edge_weights[:slots]))
+        weighted = weighted[np.argsort(graph._edge_order[weighted], kind='stable')]
+        u, v = np.divmod(graph._edge_keys[weighted], graph._max_nodes)
+        for edge, weight in zip(zip(u.tolist(), v.tolist()), graph._edge_weights[weighted].tolist()):
+            graph._move_edge_weight(edge, None, weight)
+
+        graph._num_edges = len(weighted)
+        graph._unsynced_slots = set(weighted.tolist())
+        # ===Node & Index Phase End===
+
+        graph.__dict__.update(objects['attributes'])
+        graph._G.graph.update(objects['graph'])
+
+        return graph
+
+    def __setstate__(self, state: dict) -> None:
+        super().__setstate__(state)
+
+        if '_edge_slot' in state:
+            return
+
+        # graphs pickled before the edge arrays stored the judgements of each edge in the nx.Graph,
+        # either as count vector or as list of judgements (nan = no judgement)
+        edge_judgement_counts = self._G.graph.pop('edge_judgement_counts', {})
+        for edge, weights in self._G.graph.pop('edge_added_weights', {}).items():
+            counts = edge_judgement_counts[edge] = [0] * _JUDGEMENT_LEVELS
+            for weight in weights:
+                judgement = _judgement_level(0 if np.isnan(weight) else weight)
+                counts.extend([0] * (judgement + 1 - len(counts)))
+                counts[judgement] += 1
+
+        labels = self.labels
+        self._init_storage()
+        self.labels[:] = labels
+        self._node_present[list(self._G.nodes())] = True
+
+        # their weight-edges dict could contain every weight an edge ever had
+        self._G.graph['weight_edge'] = {}
+        self._G.graph.pop('weight_edge_position', None)
+
+        for (u, v), counts in edge_judgement_counts.items():
+            slot = self._add_edge_slot(u, v)
+            if len(counts) > self._edge_counts.shape[1]:
+                self._grow_judgement_levels(len(counts))
+            self._edge_counts[slot, :len(counts)] = counts
+
+        # the edge-weight dict is ordered by the first weight of the edges
+        for edge, weight in self._G.graph['edge_weight'].items():
+            slot = self._edge_slot[self._pack_edge(*edge)]
+            self._edge_order[slot] = self._num_edges
+            self._num_edges += 1
+            self._move_edge_weight(edge, None, weight)
+            self._edge_weights[slot] = weight
 
     def __str__(self):
         return 'Distribution: {}\nNumber of Nodes: {}\nNumber of Edges: {}\nNumber of Judgements: {}\nNumber of Communities: {}'\
-            .format(self.G.graph['distribution'], self.get_number_nodes(), self.get_number_edges(), self.get_num_added_edges(), self.get_number_communities())
+            .format(self._G.graph['distribution'], self.get_number_nodes(), self.get_number_edges(), self.get_num_added_edges(), self.get_number_communities())
+
+
+def _judgement_level(weight: float) -> int:
+    """
+    Index of a judgement in the count vector of an edge.
+
+    Args:
+        :param weight: judgement, non-negative integer (0 = no judgement)
+        :return int: index in the count vector
+    """
+    judgement = int(weight)
+    if judgement != weight or judgement < 0:
+        raise ValueError('Judgements have to be non-negative integers, got {}'.format(weight))
+    return judgement
+
+
+def _judgement_levels(weights: np.ndarray) -> np.ndarray:
+    """
+    Vectorized _judgement_level.
+
+    Args:
+        :param weights: judgements, non-negative integers (0 = no judgement)
+        :return np.ndarray: indices in the count vectors
+    """
+    invalid = ~np.isfinite(weights) | (weights < 0) | (weights != np.trunc(weights))
+    if invalid.any():
+        raise ValueError('Judgements have to be non-negative integers, got {}'.format(weights[invalid][0]))
+    return weights.astype(np.int64)
+
+
+def _count_median(counts: list) -> float or None:
+    """
+    Median of the judgements of an edge, ignoring zero judgements (same as np.nanmedian with 0 as nan).
+    Runs in O(len(counts)), independent of the number of judgements.
+
+    Args:
+        :param counts: count vector, index = judgement
+        :return float: median, None if only zero judgements were made
+    """
+    total = sum(counts) - counts[0]
+    if total == 0:
+        return None
+
+    # ranks of the (two) middle judgements
+    lower_rank, upper_rank = (total - 1) // 2, total // 2
+
+    lower = None
+    cumulative = 0
+    for judgement in range(1, len(counts)):
+        cumulative += counts[judgement]
+        if lower is None and cumulative > lower_rank:
+            lower = judgement
+        if cumulative > upper_rank:
+            return (lower + judgement) / 2
+
+
+def _count_medians(counts: np.ndarray) -> np.ndarray:
+    """
+    Vectorized _count_median of several count vectors.
+
+    Args:
+        :param counts: (m, levels) count vectors, index = judgement
+        :return np.ndarray: medians, nan if only zero judgements were made
+    """
+    cumulative = np.cumsum(counts[:, 1:], axis=1)
+    total = cumulative[:, -1]
+
+    # the middle judgements are the first, whose cumulative count exceeds their rank
+    lower = (cumulative <= ((total - 1) // 2)[:, None]).sum(axis=1) + 1
+    upper = (cumulative <= (total // 2)[:, None]).sum(axis=1) + 1
+
+    return np.where(total > 0, (lower + upper) / 2, np.nan)
@@ -1,5 +1,9 @@
-import pickle
+import copy
+import weakref
 import networkx as nx
+import numpy as np
+
+from graphs.utils import serialization
 
 
 class BaseGraph():
@@ -11,25 +15,140 @@ class BaseGraph():
     Thus also allowing for new graphs to be used with this framework!
     """
 
+    # attributes holding the nodes, edges and weights, shared copy-on-write between a graph and its snapshots
+    _edge_data_attributes = ('_G',)
+
     def __init__(self):
-        self.G = nx.Graph(directed=False)
+        self._G = nx.Graph(directed=False)
         # should be replaced by node_community dict
         self.labels = []
 
         # community/node dict
-        self.G.graph['community_nodes'] = {}
-        self.G.graph['node_community'] = {}
+        self._G.graph['community_nodes'] = {}
+        self._G.graph['node_community'] = {}
 
         # edge/weight dicts (should be base weights)
-        self.G.graph['edge_weight'] = {}
-        self.G.graph['weight_edge'] = {}
-        self.G.graph['edge_soft_weight'] = {}
+        self._G.graph['edge_weight'] = {}
+        self._G.graph['weight_edge'] = {}
+        self._G.graph['edge_soft_weight'] = {}
+        # position of each edge in its weight_edge list, for moving edges between weights in O(1)
+        self._G.graph['weight_edge_position'] = {}
 
         # edge weight history
-        self.G.graph['edge_weight_history'] = {}
+        self._G.graph['edge_weight_history'] = {}
 
         # metric dict
-        self.G.graph['metrics'] = {}
+        self._G.graph['metrics'] = {}
+
+        # mutation counter, cached nx.Graph copies are only valid for one version
+        self._version = 0
+        self._nx_graph_cache = {}
+        # graphs sharing the edge data with this graph (None if not shared)
+        self._edge_data_sharers = None
+        # snapshots copy the shared edge data on change, the snapshotted graph keeps it in place
+        self._is_snapshot = False
+
+    # nx graph functionality
+    @property
+    def G(self) -> nx.Graph:
+        """
+        The nx.Graph representation of this graph.
+        Graphs, which build their edges lazily, are materialized on first access.
+        Nodes and graph dicts (communities, metrics) can be accessed through the getters without materialization.
+        """
+        self._materialize()
+        return self._G
+
+    @G.setter
+    def G(self, graph: nx.Graph) -> None:
+        self._mutated()
+        self._G = graph
+
+    def _materialize(self) -> None:
+        """
+        Hook for graphs, which defer building (parts of) their nx.Graph. Called before every access of :G:.
+        """
+        return
+
+    def _mutated(self) -> None:
+        """
+        Has to be called by every function, before it changes the edges or weight dicts.
+        Evicts the cached nx.Graph copies and unshares the edge data, if it is shared with a snapshot:
+            a snapshot copies its edge data, a snapshotted graph keeps its edge data in place
+            (thus references to it, e.g. G.nodes, stay valid) and moves its snapshots onto one copy.
+        """
+        self._version += 1
+        # the cache might be shared with snapshots, thus it is replaced instead of cleared
+        self._nx_graph_cache = {}
+
+        if self._edge_data_sharers is None:
+            return
+
+        sharers = self._edge_data_sharers
+        sharers.discard(self)
+        self._edge_data_sharers = None
+
+        if self._is_snapshot:
+            if len(sharers) > 0:
+                for name in self._edge_data_attributes:
+                    setattr(self, name, copy.deepcopy(getattr(self, name)))
+            return
+
+        # the memo is shared, so the snapshots keep sharing the copied edge data between them
+        memo = {}
+        for snapshot in list(sharers):
+            for name in self._edge_data_attributes:
+                setattr(snapshot, name, copy.deepcopy(getattr(snapshot, name), memo))
+
+    def snapshot(self):
+        """
+        Returns a cheap copy of this graph, e.g. for analysing its current state in listeners.
+        The edge data (nx.Graph nodes & edges, weight dicts, ...) is shared copy-on-write,
+            before either graph changes it, the snapshot is given its own copy (see :_mutated:).
+            Only the community/label state, which preprocessing (clustering) changes, and the metric dict are copied.
+            The cached nx.Graph copies are shared as long as both graphs are unchanged.
+
+        Args:
+            :return BaseGraph: snapshot of the same class
+        """
+        if self._edge_data_sharers is None:
+            self._edge_data_sharers = weakref.WeakSet([self])
+
+        snapshot = copy.copy(self)
+        snapshot._is_snapshot = True
+        snapshot._nx_graph_cache = self._nx_graph_cache
+        snapshot._edge_data_sharers = self._edge_data_sharers
+        self._edge_data_sharers.add(snapshot)
+
+        # the nodes and edges of the nx.Graph are shared, its graph dict is copied
+        snapshot._G = self._G.__class__()
+        snapshot._G._node, snapshot._G._adj = self._G._node, self._G._adj
+        snapshot._G.graph.update(self._G.graph)
+
+        snapshot._G.graph['community_nodes'] = {k: list(v) for k, v in self._G.graph['community_nodes'].items()}
+        snapshot._G.graph['node_community'] = dict(self._G.graph['node_community'])
+        snapshot._G.graph['metrics'] = dict(self._G.graph['metrics'])
+        snapshot.labels = copy.copy(self.labels)
+
+        return snapshot
+
+    def __getstate__(self) -> dict:
+        # cached nx.Graph copies are neither pickled nor deep copied, such copies do not share their edge data
+        state = self.__dict__.copy()
+        state['_nx_graph_cache'] = {}
+        state['_edge_data_sharers'] = None
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        # graphs pickled before the lazy nx.Graph access stored it as G
+        if 'G' in state:
+            state['_G'] = state.pop('G')
+        # graphs pickled before the nx.Graph cache
+        state.setdefault('_version', 0)
+        state.setdefault('_nx_graph_cache', {})
+        state.setdefault('_edge_data_sharers', None)
+        state.setdefault('_is_snapshot', False)
+        self.__dict__.update(state)
 
     # Edge functionality
 
@@ -38,6 +157,17 @@ class BaseGraph():
         edge = self.G.get_edge_data(u_node, v_node)
         return None if edge is None else edge['weight']
 
+    def get_edges(self, u_nodes, v_nodes, **params) -> np.ndarray:
+        """
+        Returns the weights of the edges (u_nodes[i], v_nodes[i]), as given by :get_edge:.
+
+        Args:
+            :param u_nodes: first nodes of the edges
+            :param v_nodes: second nodes of the edges
+            :return np.ndarray: weight of each edge
+        """
+        return np.array([self.get_edge(u, v, **params) for u, v in zip(u_nodes, v_nodes)])
+
     def get_edge_weight_history(self, u_node: int, v_node: int, **params) -> list:
         return self.G.graph['edge_weight_history'].get((u_node, v_node), [])
 
@@ -45,25 +175,112 @@ class BaseGraph():
         raise NotImplementedError
 
     def add_edge(self, node_u: int, node_v: int, weight: float, **params) -> None:
+        self._mutated()
         self.G.add_weighted_edges_from([(node_u, node_v, weight)])
 
         u, v = sorted([node_u, node_v])
+        self._move_edge_weight((u, v), self.G.graph['edge_weight'].get((u, v), None), weight)
+
         self.G.graph['edge_weight'][(u, v)] = weight
         self.G.graph['edge_soft_weight'][(u, v)] = weight - 2.5
 
-        if self.G.graph['weight_edge'].get(weight, None) is None:
-            self.G.graph['weight_edge'][weight] = []
-        self.G.graph['weight_edge'][weight].append((u, v))
-
         if self.G.graph['edge_weight_history'].get((u, v), None) is None:
             self.G.graph['edge_weight_history'][(u, v)] = []
         self.G.graph['edge_weight_history'][(u, v)].append(weight)
 
     def add_edges(self, edge_list: list, **params) -> None:
-        for edge in edge_list:
-            self.add_edge(*edge)
+        """
+        Adds a list of edges to the graph, through :add_edges_from_arrays:.
+
+        Expected input of list:
+            [(node1: int, node2:int, weight: float), ...]
+
+        Args:
+            :param edge_list: edges to add
+        """
+        if len(edge_list) == 0:
+            return
+
+        u_nodes, v_nodes, weights = zip(*edge_list)
+        self.add_edges_from_arrays(u_nodes, v_nodes, weights, **params)
+
+    def add_edges_from_arrays(self, u_nodes: list, v_nodes: list, weights: list, **params) -> None:
+        """
+        Adds a batch of edges to the graph, with the same result as adding them one by one.
+        The nx.Graph and each edge in the weight dicts are only updated once per batch.
+
+        Args:
+            :param u_nodes: first node of each edge
+            :param v_nodes: second node of each edge
+            :param weights: weight of each edge
+        """
+        u_nodes, v_nodes, weights = np.asarray(u_nodes).tolist(), np.asarray(v_nodes).tolist(), np.asarray(weights).tolist()
+
+        # ===Guard Phase===
+        if not len(u_nodes) == len(v_nodes) == len(weights):
+            raise ValueError('Nodes and weights have to be of the same length')
+        # ===Guard Phase End===
+
+        self._mutated()
+        self.G.add_weighted_edges_from(zip(u_nodes, v_nodes, weights))
+
+        edges = [(u, v) if u <= v else (v, u) for u, v in zip(u_nodes, v_nodes)]
+
+        edge_weight_history = self.G.graph['edge_weight_history']
+        for edge, weight in zip(edges, weights):
+            if edge_weight_history.get(edge, None) is None:
+                edge_weight_history[edge] = []
+            edge_weight_history[edge].append(weight)
+
+        # the last weight of each edge is kept
+        last_weights = dict(zip(edges, weights))
+        for edge, weight in last_weights.items():
+            self._move_edge_weight(edge, self.G.graph['edge_weight'].get(edge, None), weight)
+
+        self.G.graph['edge_weight'].update(last_weights)
+        self.G.graph['edge_soft_weight'].update((edge, weight - 2.5) for edge, weight in last_weights.items())
+
+    def _move_edge_weight(self, edge: tuple, old_weight: float or None, new_weight: float) -> None:
+        """
+        Moves an edge from its old weight to its new weight in the weight-edges dict in O(1).
+        The edge is swap-removed from the list of its old weight, empty lists are removed.
+
+        Args:
+            :param edge: sorted edge (u, v)
+            :param old_weight: current weight of the edge, None if it is new
+            :param new_weight: new weight of the edge
+        """
+        if old_weight == new_weight:
+            return
+
+        weight_edge = self._G.graph['weight_edge']
+        position = self._G.graph.setdefault('weight_edge_position', {})
+
+        if old_weight is not None:
+            edges = weight_edge[old_weight]
+            # dicts build without positions (e.g. complete true graphs) fall back to a search
+            index = position[edge] if edge in position else edges.index(edge)
+
+            last_edge = edges.pop()
+            if index < len(edges):
+                edges[index] = last_edge
+                position[last_edge] = index
+
+            if len(edges) == 0:
+                del weight_edge[old_weight]
+
+        if weight_edge.get(new_weight, None) is None:
+            weight_edge[new_weight] = []
+        position[edge] = len(weight_edge[new_weight])
+        weight_edge[new_weight].append(edge)
 
     # Node functionality
+    def get_nodes(self):
+        """
+        Returns the nodes of this graph (supporting len, in and iteration), without materializing its edges.
+        """
+        return self._G.nodes()
+
     def get_last_added_node(self) -> tuple:
         raise NotImplementedError
 
@@ -72,19 +289,19 @@ class BaseGraph():
 
     # info functions
     def get_number_nodes(self) -> int:
-        return len(self.G.nodes)
+        return len(self._G.nodes)
 
     def get_number_edges(self) -> int:
         return len(self.G.edges)
 
     def get_community_of_node(self, node: int) -> int:
-        return self.G.graph['node_community'][node]
+        return self._G.graph['node_community'][node]
 
     def get_number_communities(self) -> int:
-        return len(self.G.graph['community_nodes'])
+        return len(self._G.graph['community_nodes'])
 
     def get_community_sizes(self) -> list:
-        return [len(v) for k, v in self.G.graph['community_nodes'].items()]
+        return [len(v) for k, v in self._G.graph['community_nodes'].items()]
 
     def get_dictionary_of_graph(self, name: str) -> list:
         return self.G.graph[name]
@@ -96,27 +313,57 @@ class BaseGraph():
         return self.G.graph['weight_edge']
 
     def get_community_nodes(self) -> dict:
-        return self.G.graph['community_nodes']
+        return self._G.graph['community_nodes']
 
     def get_node_community(self) -> dict:
-        return self.G.graph['node_community']
+        return self._G.graph['node_community']
 
     def get_metric_dict(self) -> dict:
-        return self.G.graph['metrics']
+        return self._G.graph['metrics']
 
     def get_labels(self) -> list:
         return self.labels
 
+    def is_node_connected_to_cluster(self, node: int, community) -> bool:
+        """
+        Checks, if the node has an edge to any node of the community.
+
+        Args:
+            :param node: node
+            :param community: key of the community in the community-nodes dict
+            :return bool: if connected
+        """
+        return any(self.get_edge(node, c_node) is not None for c_node in self.get_community_nodes()[community])
+
     # util functions
     def update_community_nodes_membership(self, new_community_nodes: dict) -> None:
         assert type(new_community_nodes) == dict
-        self.G.graph['community_nodes'] = new_community_nodes
+        self._G.graph['community_nodes'] = new_community_nodes
 
         for k, v in new_community_nodes.items():
             for nodes in v:
-                self.G.graph['node_community'][nodes] = k
+                self._G.graph['node_community'][nodes] = k
 
     def get_nx_graph_copy(self, weight: str = 'edge_weight', fmap=lambda x: x) -> nx.Graph:
+        """
+        Returns a nx.Graph with the specified weight dict as edge weights (or the edge weights mapped by :fmap:).
+        The graph is cached per (weight, fmap) until this graph is changed and shared between callers,
+            thus it is frozen and has to be copied before modifying it.
+
+        Args:
+            :param weight: which weight dict to use to populate the nx.Graphs edges
+            :param fmap: mapping of the edge weights, if :weight: is not a weight dict
+            :return nx.Graph: frozen graph
+        """
+        key = (weight, fmap)
+        graph = self._nx_graph_cache.get(key, None)
+
+        if graph is None:
+            graph = self._nx_graph_cache[key] = nx.freeze(self._build_nx_graph_copy(weight, fmap))
+
+        return graph
+
+    def _build_nx_graph_copy(self, weight: str, fmap) -> nx.Graph:
         weights = self.G.graph.get(weight, None)
         assert type(weights) == dict
 
@@ -131,21 +378,62 @@ class BaseGraph():
         return graph
 
     def add_new_weight_dict(self, name: str, weight_modifier: lambda x: x) -> None:
+        self._mutated()
         self.G.graph[name] = {}
         for k, v in self.G.graph['edge_weight'].items():
             self.G.graph[name][k] = weight_modifier(v)
 
-    def save_graph(self, path: str):
-        with open(path, "xb") as file:
-            pickle.dump(self, file)
-        file.close()
+    def save_graph(self, path: str, compress: bool = False):
+        """
+        Saves this graph in the binary graph format (see graphs.utils.serialization),
+            graphs, which do not implement :_serialize:, are pickled.
+
+        Args:
+            :param path: file path, must not exist
+            :param compress: if the arrays should be zstd-compressed
+        """
+        serialization.save_graph(self, path, compress=compress)
 
     @staticmethod
-    def load_graph(path: str):
-        with open(path, "rb") as file:
-            graph = pickle.load(file)
-        file.close()
-        return graph
+    def load_graph(path: str, mmap: bool = False, **params):
+        """
+        Loads a graph saved in the binary graph format or pickled.
+
+        Args:
+            :param path: file path
+            :param mmap: if the arrays should be memory-mapped read-only (shared by all processes loading the same file)
+            :param params: passed to the :_deserialize: of the graph class (e.g. lazy for true graphs)
+        """
+        return serialization.load_graph(path, mmap=mmap, **params)
+
+    def _serialize(self) -> (dict, dict, dict):
+        """
+        Splits this graph into JSON attributes, (small) python objects and numpy arrays for the binary graph format.
+
+        Args:
+            :return (attributes, objects, arrays): dicts
+        """
+        raise NotImplementedError
+
+    @classmethod
+    def _deserialize(cls, attributes: dict, objects: dict, arrays: dict, **params):
+        """
+        Rebuilds a graph from the output of :_serialize:.
+        """
+        raise NotImplementedError
+
+    def _serialize_objects(self, attributes: tuple, graph_dicts: tuple) -> dict:
+        """
+        Collects the instance attributes and graph dicts, which are not serialized as arrays or rebuild on load.
+
+        Args:
+            :param attributes: serialized/rebuild instance attributes
+            :param graph_dicts: serialized/rebuild graph dicts
+            :return dict: {'attributes': {...}, 'graph': {...}}
+        """
+        attributes = attributes + self._edge_data_attributes + ('_version', '_nx_graph_cache', '_edge_data_sharers', '_is_snapshot')
+        return {'attributes': {k: v for k, v in self.__dict__.items() if k not in attributes},
+                'graph': {k: v for k, v in self._G.graph.items() if k not in graph_dicts}}
 
     def __str__(self):
         return 'Number of Nodes: {}\nNumber of Edges: {}\nNumber of Communities: {}'\
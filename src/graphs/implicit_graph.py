@@ -0,0 +1,154 @@
+import numpy as np
+
+from scipy import stats
+
+from graphs.base_graph import BaseGraph
+from graphs.utils.distribution import Distribution
+
+
+class ImplicitGraph(BaseGraph):
+
+    def __init__(self, communities: list, communities_probability: list = None, distribution: Distribution = None, seed: int = None):
+        """
+        Implicit simulation graph class, for simulations with a huge number of word usages.
+        Only the node labels and the per-block distribution parameters are stored.
+        Each edge weight is computed on demand from a counter-based hash (SplitMix64), keyed on (seed, u, v),
+            hence the same weight is returned on every request, without ever storing the O(n^2) edges.
+            The hash is vectorized, thus batches of edges are computed at once by :get_edges:.
+
+        The graph has the same structure as an equally parametrized SimulationGraph,
+            but as its edges are never stored, it can not be materialized as nx.Graph (accessing :G: raises a TypeError).
+            Use :get_nodes:, :get_edge: and :get_edges: instead of :G:.
+
+        Args:
+            :param communities: number of communities/word usages
+            :param communities_probability: probability of a connection inside/between community
+            :param distribution: used for creating weights between edges
+            :param seed: seed of the edge weights, randomly chosen if None
+        """
+        super().__init__()
+
+        # ===Guard Phase===
+        if distribution is None:
+            raise AssertionError
+
+        if distribution.get_distribution().__name__ not in _distributions:
+            raise NotImplementedError("Distribution not implemented")
+
+        if communities_probability is None:
+            communities_probability = np.ones((len(communities), len(communities)), dtype=int)
+        # ===Guard Phase End===
+
+        self.distribution = distribution
+        self.communities_probability = np.asarray(communities_probability)
+        self.seed = seed if seed is not None else np.random.SeedSequence().entropy
+
+        self.labels = np.repeat(np.arange(len(communities)), communities)
+
+        # the numpy function of the distribution is resolved to the scipy distribution of the same name
+        self._distribution_name = self.distribution.get_distribution().__name__
+        self._distribution_params = self.distribution.get_dist_param_dict()
+        self._hash_keys = np.random.SeedSequence(self.seed).generate_state(2, dtype=np.uint64)
+        # cdf tables of the block pairs, build on first use
+        self._block_cdfs = {}
+
+        self._build_community_rep(communities)
+
+        # adding distribution info
+        self._G.graph['distribution'] = distribution
+
+    def get_edge(self, u_node: int, v_node: int, **params) -> int:
+        return int(self.get_edges([u_node], [v_node])[0])
+
+    def get_edges(self, u_nodes, v_nodes, **params) -> np.ndarray:
+        """
+        Returns the weights of the edges (u_nodes[i], v_nodes[i]), computed from two hashed uniforms per edge:
+            the first decides on the connection of both blocks, the second is mapped through the inverse cdf of the distribution.
+
+        Args:
+            :param u_nodes: first nodes of the edges
+            :param v_nodes: second nodes of the edges
+            :return np.ndarray: weight of each edge
+        """
+        u_nodes = np.asarray(u_nodes, dtype=np.int64)
+        v_nodes = np.asarray(v_nodes, dtype=np.int64)
+        u, v = np.minimum(u_nodes, v_nodes), np.maximum(u_nodes, v_nodes)
+
+        # ===Hash Phase===
+        edge_hash = _splitmix64((u.astype(np.uint64) * np.uint64(len(self.labels)) + v.astype(np.uint64)) ^ self._hash_keys[0])
+        connection = _to_uniform(_splitmix64(edge_hash + self._hash_keys[1]))
+        quantile = _to_uniform(_splitmix64(edge_hash + self._hash_keys[1] + _GOLDEN_GAMMA))
+        # ===Hash Phase End===
+
+        # ===Weight Phase===
+        blocks_u, blocks_v = self.labels[u], self.labels[v]
+        connected = connection < self.communities_probability[blocks_u, blocks_v]
+
+        weights = np.zeros(len(u), dtype=np.int64)
+        block_pairs = blocks_u * len(self.communities_probability) + blocks_v
+        for block_pair in np.unique(block_pairs[connected]).tolist():
+            edges = np.flatnonzero((block_pairs == block_pair) & connected)
+            # inverse cdf of a discrete distribution: number of support values, whose cdf is not above the uniform
+            weights[edges] = np.searchsorted(self._block_cdf(*divmod(block_pair, len(self.communities_probability))), quantile[edges], side='right')
+        # ===Weight Phase End===
+
+        # no self loops, equal to the (shifted) diagonal of a SimulationGraph
+        weights[u == v] = 0
+        return weights + 1
+
+    def _block_cdf(self, block_u: int, block_v: int) -> np.ndarray:
+        cdf = self._block_cdfs.get((block_u, block_v), None)
+        if cdf is None:
+            distribution = _distributions[self._distribution_name](**self._distribution_params[block_u][block_v])
+            cdf = self._block_cdfs[(block_u, block_v)] = distribution.cdf(np.arange(distribution.support()[1]))
+        return cdf
+
+    def get_nodes(self):
+        return range(len(self.labels))
+
+    def get_number_nodes(self) -> int:
+        return len(self.labels)
+
+    def get_number_edges(self) -> int:
+        # complete graph
+        return len(self.labels) * (len(self.labels) - 1) // 2
+
+    def _materialize(self) -> None:
+        raise TypeError('ImplicitGraph does not store its edges and can not be materialized as nx.Graph, '
+                        'use get_nodes, get_edge and get_edges instead')
+
+    def _build_community_rep(self, communities: list) -> None:
+        community_nodes = {}
+        node_community = {}
+
+        start = 0
+        for label, size in enumerate(communities):
+            community_nodes[label] = list(range(start, start + size))
+            node_community.update(dict.fromkeys(community_nodes[label], label))
+            start += size
+
+        self._G.graph['community_nodes'] = community_nodes
+        self._G.graph['node_community'] = node_community
+
+    def __str__(self):
+        return 'Distribution: {}\nNumber of Nodes: {}\nNumber of Edges: {}\nNumber of Communities: {}'\
+            .format(self._G.graph['distribution'], self.get_number_nodes(), self.get_number_edges(), self.get_number_communities())
+
+
+# discrete scipy distributions (with finite support from 0) of the numpy distributions
+_distributions = {'binomial': stats.binom}
+
+_GOLDEN_GAMMA = np.uint64(0x9E3779B97F4A7C15)
+
+
+def _splitmix64(x: np.ndarray) -> np.ndarray:
+    # finalizer of SplitMix64, uint64 arithmetic wraps around
+    x = x + _GOLDEN_GAMMA
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+
+def _to_uniform(x: np.ndarray) -> np.ndarray:
+    # upper 53 bits as float in [0, 1)
+    return (x >> np.uint64(11)) * (1.0 / (1 << 53))
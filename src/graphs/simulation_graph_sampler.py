@@ -1,12 +1,16 @@
+import os
+import json
 import random
 import numpy as np
 
 from typing import List
+from multiprocessing import Pool
 
 from scipy.stats import lognorm
 
 from graphs.utils.distribution import Binomial
 from graphs.simulation_graph import SimulationGraph
+from graphs.utils.serialization import save_graph
 
 
 class SimulationGraphSampler:
@@ -43,6 +47,67 @@ class SimulationGraphSampler:
         community_dispensation, distribution = self._build_parameters()
         return SimulationGraph(community_dispensation, distribution=distribution)
 
+    def sample_simulation_graphs(self, number_graphs: int, path_out: str, seed: int = None, processes: int = None, compress: bool = False,
+                                 name: str = 'graph_{}.graph', manifest: str = 'manifest.jsonl') -> str:
+        """
+        Samples a batch of simulation graphs across a process pool and writes each graph to :path_out:, as soon as it is completed.
+
+        Each graph is sampled from its own child of numpy.random.SeedSequence(seed), hence the batch is reproducible
+            independent of the number of processes and the order the graphs complete in.
+        For each written graph, a line with its file, seed and sampled parameters is written to the manifest (JSONL),
+            with which the graph can be rebuild exactly (see :rebuild_simulation_graph:).
+            An existing manifest of the same name is overwritten, as are the graphs.
+
+        Args:
+            :param number_graphs: number of graphs to sample
+            :param path_out: directory the graphs and the manifest are written to
+            :param seed: entropy of the root seed sequence, randomly chosen if None
+            :param processes: number of worker processes, os.cpu_count() if None
+            :param compress: if the graphs should be saved compressed
+            :param name: file name of the graphs, formatted with the graph index
+            :param manifest: file name of the manifest
+            :return str: path of the manifest
+        """
+        os.makedirs(path_out, exist_ok=True)
+
+        root_seed = np.random.SeedSequence(seed)
+        jobs = [(self, child, index, path_out, name.format(index), compress) for index, child in enumerate(root_seed.spawn(number_graphs))]
+
+        manifest_path = '{}/{}'.format(path_out, manifest)
+        with Pool(processes) as pool, open(manifest_path, 'w') as manifest_file:
+            for record in pool.imap_unordered(_sample_simulation_graph_job, jobs):
+                manifest_file.write(json.dumps(record) + '\n')
+                manifest_file.flush()
+
+        return manifest_path
+
+    @staticmethod
+    def rebuild_simulation_graph(record: dict) -> SimulationGraph:
+        """
+        Rebuilds a simulation graph of a batch from its manifest record.
+        The states of the global random and numpy generators are restored afterwards.
+
+        Args:
+            :param record: manifest record (line) of the graph
+            :return SimulationGraph: the same graph, as sampled in the batch
+        """
+        communities = record['parameters']['communities']
+        distribution_flag, *distribution_params = record['parameters']['distribution']
+
+        # the recorded parameters are resolved, hence the distribution builders do not draw from random
+        sampler = SimulationGraphSampler(None, len(communities), communities, record['parameters']['distribution'])
+        if distribution_flag not in sampler.distr_flags:
+            raise NotImplementedError("Distribution not implemented")
+        distribution = sampler.distr_flags[distribution_flag](len(communities), *distribution_params)
+
+        random_state, np_random_state = random.getstate(), np.random.get_state()
+        try:
+            _seed_global_generators(np.random.SeedSequence(record['seed']['entropy'], spawn_key=tuple(record['seed']['spawn_key'])))
+            return SimulationGraph(communities, distribution=distribution)
+        finally:
+            random.setstate(random_state)
+            np.random.set_state(np_random_state)
+
     def _build_parameters(self):
         """
         Builds a new simulation graph
@@ -221,3 +286,34 @@ class SimulationGraphSampler:
         dividers = sorted(random.sample(
             range(1, num_nodes), num_communities - 1))
         return [a - b for a, b in zip(dividers + [num_nodes], [0] + dividers)]
+
+
+def _seed_global_generators(seed_sequence: np.random.SeedSequence) -> None:
+    # parameters are sampled with random, edge weights with the global numpy generator
+    state = seed_sequence.generate_state(4)
+    random.seed(int(state[0]) << 32 | int(state[1]))
+    np.random.seed(state)
+
+
+def _sample_simulation_graph_job(job: tuple) -> dict:
+    """
+    Samples and saves one graph of a batch in a worker process.
+
+    Args:
+        :param job: (sampler, seed sequence, graph index, output directory, file name, compress)
+        :return dict: manifest record of the graph
+    """
+    sampler, seed_sequence, index, path_out, file_name, compress = job
+
+    _seed_global_generators(seed_sequence)
+    community_dispensation, distribution = sampler._build_parameters()
+    communities = [int(size) for size in community_dispensation]
+
+    # edge weights are sampled from the same state, a rebuild does not have to resample the parameters
+    _seed_global_generators(seed_sequence)
+    graph = SimulationGraph(communities, distribution=distribution)
+    save_graph(graph, '{}/{}'.format(path_out, file_name), compress=compress, overwrite=True)
+
+    return {'index': index, 'file': file_name,
+            'seed': {'entropy': seed_sequence.entropy, 'spawn_key': list(seed_sequence.spawn_key)},
+            'parameters': {'communities': communities, 'distribution': [sampler.distribution_flag, *distribution.get_dist_param()]}}
@@ -0,0 +1,183 @@
+"""
+Compact, versioned on-disk format of graphs.
+
+Layout:
+    magic (8 bytes) | format version (uint32) | header length (uint64) | JSON header | arrays
+The header holds the graph class, its JSON attributes and the dtype, shape, offset and compression of each array.
+    Each array starts at a 64-byte aligned offset. Small python objects (distribution, metric dict, ...)
+    are stored pickled in the array '__objects__'.
+
+Graphs implement :_serialize: and :_deserialize:, all other graphs are pickled as before.
+"""
+
+import importlib
+import json
+import pickle
+import struct
+import numpy as np
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+MAGIC = b'WUGGRAPH'
+FORMAT_VERSION = 1
+
+_PREFIX = struct.Struct('<8sIQ')
+_ALIGNMENT = 64
+_OBJECTS = '__objects__'
+
+
+def save_graph(graph, path: str, compress: bool = False, overwrite: bool = False) -> None:
+    """
+    Saves a graph in the binary format, or pickled, if the graph does not support it.
+
+    Args:
+        :param graph: graph to save
+        :param path: file path
+        :param compress: if the arrays should be zstd-compressed
+        :param overwrite: if an existing file should be overwritten
+    """
+    try:
+        attributes, objects, arrays = graph._serialize()
+    except NotImplementedError:
+        with open(path, 'wb' if overwrite else 'xb') as file:
+            pickle.dump(graph, file)
+        file.close()
+        return
+
+    arrays = dict(arrays)
+    arrays[_OBJECTS] = np.frombuffer(pickle.dumps(objects), dtype=np.uint8)
+
+    # ===Encoding Phase===
+    if compress and zstandard is None:
+        raise ImportError('zstandard is required for compressed graph files')
+    compressor = zstandard.ZstdCompressor() if compress else None
+
+    blobs = []
+    array_header = {}
+    offset = 0
+    for name, array in arrays.items():
+        array = np.ascontiguousarray(array)
+        blob = compressor.compress(array.tobytes()) if compress else array.data
+
+        array_header[name] = {'dtype': array.dtype.str, 'shape': list(array.shape), 'offset': offset,
+                              'nbytes': len(blob) if compress else array.nbytes, 'compression': 'zstd' if compress else None}
+        blobs.append(blob)
+        offset = _align(offset + array_header[name]['nbytes'])
+
+    header = json.dumps({'class': '{}.{}'.format(type(graph).__module__, type(graph).__qualname__),
+                         'attributes': attributes, 'arrays': array_header}).encode('utf-8')
+    data_offset = _align(_PREFIX.size + len(header))
+    # ===Encoding Phase End===
+
+    # ===Write Phase===
+    with open(path, 'wb' if overwrite else 'xb') as file:
+        file.write(_PREFIX.pack(MAGIC, FORMAT_VERSION, len(header)))
+        file.write(header)
+
+        for name, blob in zip(array_header, blobs):
+            file.seek(data_offset + array_header[name]['offset'])
+            file.write(blob)
+    file.close()
+    # ===Write Phase End===
+
+
+def load_graph(path: str, mmap: bool = False, **params):
+    """
+    Loads a graph saved in the binary format or pickled.
+
+    Args:
+        :param path: file path
+        :param mmap: if uncompressed arrays should be memory-mapped read-only instead of read,
+            processes mapping the same file share one physical copy (only kept by true graphs)
+        :param params: passed to the :_deserialize: of the graph class (e.g. lazy for true graphs)
+        :return BaseGraph: loaded graph
+    """
+    if not is_graph_file(path):
+        with open(path, 'rb') as file:
+            graph = pickle.load(file)
+        file.close()
+        return graph
+
+    with open(path, 'rb') as file:
+        _, version, header_length = _PREFIX.unpack(file.read(_PREFIX.size))
+        if version > FORMAT_VERSION:
+            raise ValueError('Graph file version {} is newer than the supported version {}'.format(version, FORMAT_VERSION))
+
+        header = json.loads(file.read(header_length).decode('utf-8'))
+        data_offset = _align(_PREFIX.size + header_length)
+
+        arrays = {}
+        for name, info in header['arrays'].items():
+            file.seek(data_offset + info['offset'])
+            arrays[name] = _map_array(path, data_offset + info['offset'], info) if mmap and info['compression'] is None and name != _OBJECTS\
+                else _read_array(file, info)
+    file.close()
+
+    objects = pickle.loads(arrays.pop(_OBJECTS).tobytes())
+
+    module, name = header['class'].rsplit('.', 1)
+    graph_class = getattr(importlib.import_module(module), name)
+    return graph_class._deserialize(header['attributes'], objects, arrays, **params)
+
+
+def is_graph_file(path: str) -> bool:
+    """
+    Checks, if the file is saved in the binary format (and not pickled).
+    """
+    with open(path, 'rb') as file:
+        magic = file.read(len(MAGIC))
+    file.close()
+    return magic == MAGIC
+
+
+def convert_pickled_graph(path: str, path_out: str = None, compress: bool = False) -> bool:
+    """
+    Converts a pickled graph into the binary format.
+
+    Args:
+        :param path: path of the pickled graph
+        :param path_out: path of the converted graph, overwrites the pickled graph if None
+        :param compress: if the arrays should be zstd-compressed
+        :return bool: if the graph was converted (False if already binary or not supported)
+    """
+    if is_graph_file(path):
+        return False
+
+    with open(path, 'rb') as file:
+        graph = pickle.load(file)
+    file.close()
+
+    try:
+        graph._serialize()
+    except NotImplementedError:
+        return False
+
+    save_graph(graph, path if path_out is None else path_out, compress=compress, overwrite=True)
+    return True
+
+
+def _read_array(file, info: dict) -> np.ndarray:
+    dtype = np.dtype(info['dtype'])
+
+    if info['compression'] == 'zstd':
+        raw = zstandard.ZstdDecompressor().decompress(file.read(info['nbytes']))
+        return np.frombuffer(bytearray(raw), dtype=dtype).reshape(info['shape'])
+
+    array = np.empty(info['shape'], dtype=dtype)
+    if array.size > 0:
+        file.readinto(memoryview(array).cast('B'))
+    return array
+
+
+def _map_array(path: str, offset: int, info: dict) -> np.ndarray:
+    # np.memmap can not map empty arrays
+    if np.prod(info['shape']) == 0:
+        return np.empty(info['shape'], dtype=np.dtype(info['dtype']))
+    return np.memmap(path, dtype=np.dtype(info['dtype']), mode='r', offset=offset, shape=tuple(info['shape']))
+
+
+def _align(offset: int) -> int:
+    return -(-offset // _ALIGNMENT) * _ALIGNMENT
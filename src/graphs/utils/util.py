@@ -1,3 +1,5 @@
+import numpy as np
+
 from numpy.random import binomial, geometric, poisson
 
 
@@ -29,3 +31,84 @@ def generate_pdf_parameter_dicts(size: int, distribution: str, diag_prob: float,
         parameters.append(tmp_param)
 
     return pdf, parameters
+
+
+def build_edge_dicts(adjacency_matrix: np.ndarray) -> (list, dict, dict):
+    """
+    Builds the weighted edge list, edge-weight dict and weight-edges dict of a complete graph
+        from the upper triangle of its adjacency matrix.
+
+    Weights are truncated to int. Edges are ordered row-major (i < j),
+        the weight-edges dict keeps the weights in order of their first appearance.
+
+    Args:
+        :param adjacency_matrix: (n, n) weight matrix
+        :return (edge_list, edge_weight, weight_edge): [(u, v, w), ...], {(u, v): w}, {w: [(u, v), ...]}
+    """
+    rows, cols = np.triu_indices(len(adjacency_matrix), k=1)
+    weights = adjacency_matrix[rows, cols].astype(np.int64)
+
+    rows, cols, weight_list = rows.tolist(), cols.tolist(), weights.tolist()
+    edges = list(zip(rows, cols))
+
+    edge_list = list(zip(rows, cols, weight_list))
+    edge_weight = dict(zip(edges, weight_list))
+
+    # one stable sort groups all edges by weight while keeping the row-major order inside each group
+    order = np.argsort(weights, kind='stable')
+    unique_weights, first_index, counts = np.unique(weights, return_index=True, return_counts=True)
+    bounds = np.concatenate(([0], np.cumsum(counts)))
+
+    weight_edge = {}
+    for k in np.argsort(first_index):
+        weight_edge[int(unique_weights[k])] = list(map(edges.__getitem__, order[bounds[k]:bounds[k + 1]].tolist()))
+
+    return edge_list, edge_weight, weight_edge
+
+
+def sbm_adjacency(communities: list, communities_probability: np.ndarray, wt, wtargs) -> (np.ndarray, np.ndarray):
+    """
+    Samples the weighted, undirected adjacency matrix of a stochastic block model without loops,
+        drawing the weights of each block with a single vectorized call of its distribution.
+
+    Same layout as graspologic.simulations.sbm(..., return_labels=True):
+        nodes are ordered by community, the diagonal is zero, absent edges have weight 0.
+
+    Args:
+        :param communities: size of each community
+        :param communities_probability: (k, k) probability of an edge inside/between communities
+        :param wt: numpy sampling function (e.g. np.random.binomial), either one for all blocks or a (k, k) nested list
+        :param wtargs: parameters of the sampling function, either one dict for all blocks or a (k, k) nested list
+        :return (adjacency_matrix, labels): (n, n) float matrix, community label of each node
+    """
+    sizes = np.asarray(communities, dtype=np.int64)
+    bounds = np.concatenate(([0], np.cumsum(sizes)))
+    labels = np.repeat(np.arange(len(sizes)), sizes)
+    communities_probability = np.asarray(communities_probability)
+
+    adjacency_matrix = np.zeros((bounds[-1], bounds[-1]))
+
+    for i in range(len(sizes)):
+        for j in range(i, len(sizes)):
+            block_wt = wt[i][j] if isinstance(wt, (list, tuple, np.ndarray)) else wt
+            block_wtargs = wtargs[i][j] if isinstance(wtargs, (list, tuple, np.ndarray)) else wtargs
+
+            # diagonal blocks only draw their upper triangle
+            size = sizes[i] * (sizes[i] - 1) // 2 if i == j else sizes[i] * sizes[j]
+            weights = np.zeros(size)
+            if communities_probability[i][j] >= 1:
+                weights[:] = block_wt(size=size, **block_wtargs)
+            else:
+                mask = np.random.uniform(size=size) < communities_probability[i][j]
+                weights[mask] = block_wt(size=int(mask.sum()), **block_wtargs)
+
+            if i == j:
+                block = np.zeros((sizes[i], sizes[i]))
+                block[np.triu_indices(sizes[i], k=1)] = weights
+                adjacency_matrix[bounds[i]:bounds[i + 1], bounds[i]:bounds[i + 1]] = block + block.T
+            else:
+                block = weights.reshape(sizes[i], sizes[j])
+                adjacency_matrix[bounds[i]:bounds[i + 1], bounds[j]:bounds[j + 1]] = block
+                adjacency_matrix[bounds[j]:bounds[j + 1], bounds[i]:bounds[i + 1]] = block.T
+
+    return adjacency_matrix, labels
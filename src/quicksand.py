@@ -3,6 +3,7 @@ import pickle
 import numpy as np
 
 from graphs.fitted_graph import FittedGraph
+from graphs.utils.serialization import save_graph
 
 from visualization.graph_visualization import draw_graph_gt as draw
 
@@ -24,7 +25,5 @@ for _, _, files in os.walk(path):
         draw(graph, '{}/{}.png'.format(path_draw, dict_file.replace('.distribution', '')))
 
         print('Writing Graph to {}'.format('{}/{}.graph'.format(path_out, dict_file.replace('.distribution', ''))))
-        with open('{}/{}.graph'.format(path_out, dict_file.replace('.distribution', '')), 'wb') as file:
-            pickle.dump(graph, file)
-        file.close()
+        save_graph(graph, '{}/{}.graph'.format(path_out, dict_file.replace('.distribution', '')), overwrite=True)
 # draw(graph)
@@ -0,0 +1,59 @@
+import sys
+import time
+import numpy as np
+
+sys.path.append('src')
+
+from graphs.utils.util import build_edge_dicts
+
+"""
+Benchmarks the construction of the edge list, edge-weight dict and weight-edges dict of a true graph,
+    comparing the former nested-loop construction against the vectorized builder.
+
+Usage:
+    python src/scripts/benchmarks/graph_construction_benchmark.py [n ...]
+"""
+
+
+def _loop_build_edge_dicts(adjacency_matrix: np.ndarray) -> (list, dict, dict):
+    # former construction of SimulationGraph/FittedGraph._build_nx_graph_rep
+    edge_list = []
+    edge_weight = {}
+    weight_edge = {}
+
+    for i in range(len(adjacency_matrix)):
+        for j in range(i + 1, len(adjacency_matrix)):
+            edge_list.append((i, j, int(adjacency_matrix[i][j])))
+            edge_weight[(i, j)] = int(adjacency_matrix[i][j])
+
+            if weight_edge.get(int(adjacency_matrix[i][j]), None) is None:
+                weight_edge[int(adjacency_matrix[i][j])] = []
+            weight_edge[int(adjacency_matrix[i][j])].append((i, j))
+
+    return edge_list, edge_weight, weight_edge
+
+
+def _random_adjacency(n: int) -> np.ndarray:
+    adjacency_matrix = np.triu(np.random.binomial(3, 0.5, size=(n, n)), k=1).astype(float)
+    return adjacency_matrix + adjacency_matrix.T + 1
+
+
+def _time(function, *args) -> float:
+    start_time = time.time()
+    function(*args)
+    return time.time() - start_time
+
+
+def run_benchmark(sizes: list) -> None:
+    print('{:>6}\t{:>10}\t{:>10}\t{:>8}'.format('n', 'loop [s]', 'numpy [s]', 'speedup'))
+    for n in sizes:
+        adjacency_matrix = _random_adjacency(n)
+
+        loop_time = _time(_loop_build_edge_dicts, adjacency_matrix)
+        numpy_time = _time(build_edge_dicts, adjacency_matrix)
+
+        print('{:>6}\t{:>10.3f}\t{:>10.3f}\t{:>7.1f}x'.format(n, loop_time, numpy_time, loop_time / numpy_time))
+
+
+if __name__ == '__main__':
+    run_benchmark([int(n) for n in sys.argv[1:]] or [100, 500, 1000, 2000, 5000])
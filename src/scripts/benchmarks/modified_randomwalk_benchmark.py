@@ -0,0 +1,64 @@
+import sys
+import time
+import random
+
+sys.path.append('src')
+
+from graphs.simulation_graph import SimulationGraph
+from graphs.utils.distribution import Binomial
+from simulation.sampling.sampling_strategy import modified_randomwalk
+
+"""
+Benchmarks the modified random walk on a lazy simulation graph,
+    comparing the former set-difference implementation against the indexed sets.
+
+Usage:
+    python src/scripts/benchmarks/modified_randomwalk_benchmark.py [n [sample_size]]
+"""
+
+
+def _set_modified_randomwalk(graph, params: dict) -> list:
+    # former implementation of modified_randomwalk (random.sample on sets converted them to a tuple)
+    sample_size = int(params['sample_size'] / 2)
+    last_node = params['start']
+
+    contained_set = set(params['conntained_func']()).union({last_node})
+    not_contained_set = set(graph.get_nodes()).difference(contained_set)
+
+    sampled_edge_list = []
+
+    for _ in range(sample_size):
+        if len(not_contained_set) > 0:
+            unknown_node = random.sample(tuple(not_contained_set), 1)[0]
+        else:
+            unknown_node = random.sample(tuple(contained_set.difference({last_node})), 1)[0]
+        sampled_edge_list.append((last_node, unknown_node, graph.get_edge(last_node, unknown_node)))
+
+        last_node = random.sample(tuple(contained_set.difference({unknown_node})), 1)[0]
+        sampled_edge_list.append((unknown_node, last_node, graph.get_edge(unknown_node, last_node)))
+
+        not_contained_set = not_contained_set.difference({unknown_node})
+        contained_set = contained_set.union({unknown_node})
+
+    return sampled_edge_list
+
+
+def _time(function, *args) -> float:
+    start_time = time.time()
+    function(*args)
+    return time.time() - start_time
+
+
+def run_benchmark(n: int, sample_size: int) -> None:
+    graph = SimulationGraph([n // 2, n - n // 2], distribution=Binomial(3, 0.9, 2), lazy=True)
+    params = {'sample_size': sample_size, 'start': 0, 'conntained_func': lambda: []}
+
+    set_time = _time(_set_modified_randomwalk, graph, params)
+    indexed_time = _time(modified_randomwalk, graph, params)
+
+    print('{:>6}\t{:>11}\t{:>8}\t{:>11}\t{:>8}'.format('n', 'sample_size', 'sets [s]', 'indexed [s]', 'speedup'))
+    print('{:>6}\t{:>11}\t{:>8.3f}\t{:>11.3f}\t{:>7.1f}x'.format(n, sample_size, set_time, indexed_time, set_time / indexed_time))
+
+
+if __name__ == '__main__':
+    run_benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 5000, int(sys.argv[2]) if len(sys.argv) > 2 else 10000)
@@ -0,0 +1,57 @@
+import sys
+import time
+import numpy as np
+
+sys.path.append('src')
+
+from graphs.utils.distribution import Binomial
+from graphs.utils.util import sbm_adjacency
+
+"""
+Benchmarks the sampling of a simulation graph adjacency matrix,
+    comparing graspologic.simulations.sbm (if installed) against the vectorized in-house generator.
+
+Usage:
+    python src/scripts/benchmarks/sbm_benchmark.py [n ...]
+"""
+
+try:
+    from graspologic.simulations import sbm
+except ImportError:
+    sbm = None
+
+
+def _communities(n: int, k: int = 5) -> list:
+    communities = [n // k] * k
+    communities[0] += n - sum(communities)
+    return communities
+
+
+def _time(function, *args, **kwargs) -> float:
+    start_time = time.time()
+    function(*args, **kwargs)
+    return time.time() - start_time
+
+
+def run_benchmark(sizes: list) -> None:
+    if sbm is None:
+        print('graspologic is not installed, only timing the in-house generator')
+
+    print('{:>6}\t{:>15}\t{:>10}\t{:>8}'.format('n', 'graspologic [s]', 'numpy [s]', 'speedup'))
+    for n in sizes:
+        communities = _communities(n)
+        distribution = Binomial(3, 0.9, len(communities))
+        communities_probability = np.ones((len(communities), len(communities)), dtype=int)
+
+        numpy_time = _time(sbm_adjacency, communities, communities_probability, distribution.get_distribution(), distribution.get_dist_param_dict())
+        if sbm is None:
+            print('{:>6}\t{:>15}\t{:>10.3f}\t{:>8}'.format(n, '-', numpy_time, '-'))
+            continue
+
+        graspologic_time = _time(sbm, n=communities, p=communities_probability, wt=distribution.get_distribution(),
+                                 wtargs=distribution.get_dist_param_dict(), return_labels=True)
+        print('{:>6}\t{:>15.3f}\t{:>10.3f}\t{:>7.1f}x'.format(n, graspologic_time, numpy_time, graspologic_time / numpy_time))
+
+
+if __name__ == '__main__':
+    run_benchmark([int(n) for n in sys.argv[1:]] or [100, 500, 1000, 2000, 5000])
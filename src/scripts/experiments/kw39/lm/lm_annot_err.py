@@ -24,7 +24,7 @@ draw(graph)
 
 annotated_graph = AnnotatedGraph(20)
 
-sampling = Sampling(annotations_per_edge=1).add_sampling_strategie(mrw, {'sample_size': 10, 'start': annotated_graph.get_last_added_node, 'conntained_func': annotated_graph.G.nodes})\
+sampling = Sampling(annotations_per_edge=1).add_sampling_strategie(mrw, {'sample_size': 10, 'start': annotated_graph.get_last_added_node, 'conntained_func': annotated_graph.get_nodes})\
     .add_annotator(Annotator().add_error_sampling(np.random.poisson, dict(lam=0.35), 1, 4, 0.5).add_zero_probability(1 / 30).add_high_error_nodes([1, 2, 3], np.random.poisson, dict(lam=0.9), 1, 1, 0))\
     .set_annotator_dist('random')
 
@@ -78,7 +78,7 @@ for i, name in enumerate(['log09_clusters_n100_k{}'.format(i + 1) for i in range
         annotated_graph = AnnotatedGraph(graph.get_number_nodes())
 
         # Sampler/s
-        sampling_step = Sampling(annotations_per_edge=1).add_sampling_strategie(modified_randomwalk, {'sample_size': 10, 'start': annotated_graph.get_last_added_node, 'conntained_func': annotated_graph.G.nodes})\
+        sampling_step = Sampling(annotations_per_edge=1).add_sampling_strategie(modified_randomwalk, {'sample_size': 10, 'start': annotated_graph.get_last_added_node, 'conntained_func': annotated_graph.get_nodes})\
             .add_annotator(Annotator().add_error_sampling(np.random.poisson, dict(lam=0.35), 1, 4, 0.5))\
             .add_annotator(Annotator().add_error_sampling(np.random.poisson, dict(lam=0.35), 1, 4, 0.5))\
             .add_annotator(Annotator().add_error_sampling(np.random.poisson, dict(lam=0.35), 1, 4, 0.5))\
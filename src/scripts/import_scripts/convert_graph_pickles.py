@@ -0,0 +1,31 @@
+import os
+import sys
+sys.path.append('src')
+
+from graphs.utils.serialization import convert_pickled_graph
+
+"""
+Converts pickled graphs into the binary graph format.
+
+Usage:
+    python src/scripts/import_scripts/convert_graph_pickles.py [--compress] <file or directory> ...
+"""
+
+
+def convert_graphs(paths: list, compress: bool = False, suffix: str = '.graph') -> None:
+    for path in paths:
+        if os.path.isfile(path):
+            files = [path]
+        else:
+            files = ['{}/{}'.format(root, file) for root, _, _files in os.walk(path) for file in _files if file.endswith(suffix)]
+
+        for file in files:
+            if convert_pickled_graph(file, compress=compress):
+                print('Converted {}'.format(file))
+            else:
+                print('Skipped {}'.format(file))
+
+
+if __name__ == '__main__':
+    compress = '--compress' in sys.argv[1:]
+    convert_graphs([arg for arg in sys.argv[1:] if arg != '--compress'], compress=compress)
@@ -1,5 +1,6 @@
 from graphs.base_graph import BaseGraph
 from simulation.runnable_step import RunnableStep
+from simulation.clustering.utils.multithreaded_correlation_clustering import shutdown_pool
 
 
 class Clustering(RunnableStep):
@@ -42,7 +43,9 @@ class Clustering(RunnableStep):
 
     def clean_up(self) -> None:
         """
-        Cleanup of clustering
+        Cleanup of clustering, including the worker pool of the correlation clustering
         """
         if callable(self.clean_up_func):
             self.clean_up_func()
+
+        shutdown_pool()
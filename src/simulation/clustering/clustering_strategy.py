@@ -9,7 +9,7 @@ from simulation.clustering.utils.multithreaded_correlation_clustering import clu
 from chinese_whispers import chinese_whispers as _chinese_whispers
 from chinese_whispers import aggregate_clusters as _aggregate_clusters
 from community.community_louvain import best_partition as _louvain_partition
-from networkx import connected_components
+from networkx import connected_components, restricted_view
 from simulation.clustering.utils.utils import sort_len_nodes as _clsort
 from simulation.clustering.utils.utils import louvain_cluster_sort as _lvsort
 from simulation.clustering.utils.utils import generate_graphtool_graph as _ggg
@@ -131,7 +131,8 @@ def connected_components_clustering(graph: BaseGraph, params: dict) -> dict:
 
     edges_negative = [(i, j) for (i, j) in G.edges() if G[i]
                       [j]['weight'] < 0.0 or is_non_value(G[i][j]['weight'])]
-    G.remove_edges_from(edges_negative)
+    # the (cached) graph is frozen, the negative edges are hidden instead of removed
+    G = restricted_view(G, [], edges_negative)
     return _clsort({i: list(component) for i, component in enumerate(connected_components(G))})
 
 
@@ -147,7 +148,8 @@ def chinese_whisper_clustering(graph: BaseGraph, params: dict) -> dict:
     weights = params.get('weights', 'edge_weight')
     assert type(weights) == str
 
-    G = graph.get_nx_graph_copy(weights)
+    # chinese whispers labels the nodes of the graph, thus the (cached) frozen graph is copied
+    G = graph.get_nx_graph_copy(weights).copy()
     _cw = _aggregate_clusters(_chinese_whispers(G, weighting='top', iterations=20))
     return _clsort({k: list(v) for k, v in _cw.items()})
 
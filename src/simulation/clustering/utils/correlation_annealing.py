@@ -0,0 +1,283 @@
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+"""
+Simulated annealing for correlation clustering on signed edges stored as CSR arrays.
+
+Moving node i from cluster a to cluster b changes the linear loss by
+    sum_j W_ij * ([s_j == a] - [s_j == b])
+    over the neighbours j of i, for positive (W >= 0) as well as negative (W < 0) edges,
+    thus every move is evaluated in O(degree) instead of rescanning all edges.
+
+The annealing follows mlrose.simulated_annealing on a minimizing mlrose.DiscreteOpt with mlrose.ExpDecay,
+    drawing the same random numbers from the global numpy generator in the same order,
+    hence it returns the same state for the same seed.
+If numba is available, the annealing runs in compiled kernels, which draw from numba's own generator,
+    seeded from the global numpy generator, thus they are reproducible, but do not follow the mlrose random numbers.
+"""
+
+
+def build_signed_csr(num_nodes: int, edges_i: np.ndarray, edges_j: np.ndarray, weights: np.ndarray) -> (np.ndarray, np.ndarray, np.ndarray):
+    """
+    Builds the symmetric CSR adjacency of the signed edges.
+
+    Args:
+        :param num_nodes: number of nodes
+        :param edges_i: first node (index) of each edge
+        :param edges_j: second node (index) of each edge
+        :param weights: signed weight of each edge
+        :return (indptr, indices, data): CSR arrays, the neighbours of i are indices[indptr[i]:indptr[i + 1]]
+    """
+    edges_i = np.asarray(edges_i, dtype=np.int64)
+    edges_j = np.asarray(edges_j, dtype=np.int64)
+    weights = np.asarray(weights, dtype=float)
+
+    rows = np.concatenate((edges_i, edges_j))
+    order = np.argsort(rows, kind='stable')
+
+    indptr = np.zeros(num_nodes + 1, dtype=np.int64)
+    indptr[1:] = np.cumsum(np.bincount(rows, minlength=num_nodes))
+    indices = np.concatenate((edges_j, edges_i))[order]
+    data = np.concatenate((weights, weights))[order]
+
+    return indptr, indices, data
+
+
+def linear_loss(state: np.ndarray, edges_i: np.ndarray, edges_j: np.ndarray, weights: np.ndarray) -> float:
+    """
+    Sum of the positive edge weights between and of the absolute negative edge weights inside clusters.
+
+    Args:
+        :param state: cluster of each node (index)
+        :param edges_i: first node (index) of each edge
+        :param edges_j: second node (index) of each edge
+        :param weights: signed weight of each edge
+        :return float: loss
+    """
+    state = np.asarray(state)
+    same = state[edges_i] == state[edges_j]
+    return float(np.sum(weights[~same & (weights >= 0)]) + np.sum(np.abs(weights[same & (weights < 0)])))
+
+
+def simulated_annealing(indptr: np.ndarray, indices: np.ndarray, data: np.ndarray, max_val: int, init_state: np.ndarray = None,
+                        max_attempts: int = 10, max_iters: int = np.inf, init_temp: float = 1.0, exp_const: float = 0.005, min_temp: float = 0.001,
+                        jit: bool = True) -> np.ndarray:
+    """
+    Minimizes the linear loss by simulated annealing, moving one random node to another random cluster per iteration.
+
+    Args:
+        :param indptr: CSR index pointer (see :build_signed_csr:)
+        :param indices: CSR neighbours
+        :param data: CSR signed weights
+        :param max_val: number of clusters, states are in [0, max_val)
+        :param init_state: initial state, uniformly random if None
+        :param max_attempts: number of rejected moves in a row, after which the search stops
+        :param max_iters: maximal number of iterations
+        :param init_temp: initial temperature of the exponential decay
+        :param exp_const: decay constant of the exponential decay
+        :param min_temp: minimal temperature of the exponential decay
+        :param jit: if the numba kernel should be used (if available), else the mlrose-equivalent python loop
+        :return np.ndarray: final state
+    """
+    length = len(indptr) - 1
+    state = np.random.randint(0, max_val, length) if init_state is None else np.array(init_state)
+
+    if jit and njit is not None:
+        return _annealing_kernel(indptr, indices, data, max_val, state.astype(np.int64), max_attempts, float(max_iters),
+                                 init_temp, exp_const, min_temp, np.random.randint(0, 2 ** 31 - 1))
+
+    attempts = 0
+    iters = 0
+    while attempts < max_attempts and iters < max_iters:
+        temp = max(init_temp * np.exp(-exp_const * iters), min_temp)
+        iters += 1
+
+        # random neighbour state: node i moves from cluster a to any other cluster b
+        i = np.random.randint(0, length)
+        a = state[i]
+        if max_val == 2:
+            b = abs(a - 1)
+        else:
+            b = np.random.randint(0, max_val - 1)
+            b += b >= a
+
+        neighbours = state[indices[indptr[i]:indptr[i + 1]]]
+        weights = data[indptr[i]:indptr[i + 1]]
+        delta_e = np.sum(weights[neighbours == b]) - np.sum(weights[neighbours == a])
+
+        # improvement (loss decreases) or accepted by chance
+        if delta_e > 0 or np.random.uniform() < np.exp(delta_e / temp):
+            state[i] = b
+            attempts = 0
+        else:
+            attempts += 1
+
+    return state
+
+
+def _annealing_kernel(indptr: np.ndarray, indices: np.ndarray, data: np.ndarray, max_val: int, state: np.ndarray,
+                      max_attempts: int, max_iters: float, init_temp: float, exp_const: float, min_temp: float, seed: int) -> np.ndarray:
+    # same loop as simulated_annealing, with scalar operations only (nopython mode)
+    np.random.seed(seed)
+    length = len(indptr) - 1
+
+    attempts = 0
+    iters = 0
+    while attempts < max_attempts and iters < max_iters:
+        temp = max(init_temp * np.exp(-exp_const * iters), min_temp)
+        iters += 1
+
+        i = np.random.randint(0, length)
+        a = state[i]
+        if max_val == 2:
+            b = abs(a - 1)
+        else:
+            b = np.random.randint(0, max_val - 1)
+            if b >= a:
+                b += 1
+
+        delta_e = 0.0
+        for k in range(indptr[i], indptr[i + 1]):
+            if state[indices[k]] == b:
+                delta_e += data[k]
+            elif state[indices[k]] == a:
+                delta_e -= data[k]
+
+        if delta_e > 0 or np.random.random() < np.exp(delta_e / temp):
+            state[i] = b
+            attempts = 0
+        else:
+            attempts += 1
+
+    return state
+
+
+if njit is not None:
+    _annealing_kernel = njit(cache=True, nogil=True)(_annealing_kernel)
+
+
+def simulated_annealing_chains(indptr: np.ndarray, indices: np.ndarray, data: np.ndarray, max_vals: list, init_states: list,
+                               max_attempts: int = 10, max_iters: int = np.inf, init_temp: float = 1.0, exp_const: float = 0.005, min_temp: float = 0.001,
+                               jit: bool = True) -> np.ndarray:
+    """
+    Runs independent annealing chains (same moves, schedule and stopping rule as :simulated_annealing:) in one process.
+
+    All chains are run at once, keeping their states in one (chains x nodes) matrix,
+        each iteration proposes and evaluates one move per running chain,
+        in a compiled kernel if numba is available, else with numpy.
+
+    Args:
+        :param indptr: CSR index pointer (see :build_signed_csr:)
+        :param indices: CSR neighbours
+        :param data: CSR signed weights
+        :param max_vals: number of clusters of each chain
+        :param init_states: initial state of each chain, uniformly random if None
+        :param max_attempts: number of rejected moves in a row, after which a chain stops
+        :param max_iters: maximal number of iterations
+        :param init_temp: initial temperature of the exponential decay
+        :param exp_const: decay constant of the exponential decay
+        :param min_temp: minimal temperature of the exponential decay
+        :param jit: if the numba kernel should be used (if available)
+        :return np.ndarray: (chains x nodes) final states
+    """
+    length = len(indptr) - 1
+
+    max_vals = np.asarray(max_vals, dtype=np.int64)
+    states = np.array([np.random.randint(0, max_val, length) if init_state is None else init_state
+                       for max_val, init_state in zip(max_vals, init_states)], dtype=np.int64).reshape(len(max_vals), length)
+
+    if jit and njit is not None:
+        return _annealing_chains_kernel(indptr, indices, data, max_vals, states, max_attempts, float(max_iters),
+                                        init_temp, exp_const, min_temp, np.random.randint(0, 2 ** 31 - 1))
+
+    degrees = np.diff(indptr)
+    attempts = np.zeros(len(max_vals), dtype=np.int64)
+    running = np.flatnonzero(attempts < max_attempts)
+
+    iters = 0
+    while len(running) > 0 and iters < max_iters:
+        temp = max(init_temp * np.exp(-exp_const * iters), min_temp)
+        iters += 1
+
+        # ===Move Phase===
+        # node i of each running chain moves from cluster a to any other cluster b
+        i = np.random.randint(0, length, len(running))
+        a = states[running, i]
+        b = np.random.randint(0, max_vals[running] - 1)
+        b += b >= a
+        b[max_vals[running] == 2] = 1 - a[max_vals[running] == 2]
+        # ===Move Phase End===
+
+        # ===Delta Phase===
+        # flat positions of the neighbours of all moved nodes in the CSR arrays
+        chain_degrees = degrees[i]
+        chain = np.repeat(np.arange(len(running)), chain_degrees)
+        positions = np.repeat(indptr[i] - np.cumsum(chain_degrees) + chain_degrees, chain_degrees) + np.arange(len(chain))
+
+        neighbours = states[running[chain], indices[positions]]
+        delta_e = np.bincount(chain, weights=data[positions] * ((neighbours == b[chain]).astype(float) - (neighbours == a[chain])), minlength=len(running))
+        # ===Delta Phase End===
+
+        # ===Acceptance Phase===
+        with np.errstate(over='ignore'):
+            accepted = (delta_e > 0) | (np.random.uniform(size=len(running)) < np.exp(delta_e / temp))
+        states[running[accepted], i[accepted]] = b[accepted]
+
+        attempts[running] = np.where(accepted, 0, attempts[running] + 1)
+        running = running[attempts[running] < max_attempts]
+        # ===Acceptance Phase End===
+
+    return states
+
+
+def _annealing_chains_kernel(indptr: np.ndarray, indices: np.ndarray, data: np.ndarray, max_vals: np.ndarray, states: np.ndarray,
+                             max_attempts: int, max_iters: float, init_temp: float, exp_const: float, min_temp: float, seed: int) -> np.ndarray:
+    # same loop as simulated_annealing_chains, with scalar operations only (nopython mode)
+    np.random.seed(seed)
+    chains, length = states.shape
+
+    attempts = np.zeros(chains, dtype=np.int64)
+    running = chains if max_attempts > 0 else 0
+
+    iters = 0
+    while running > 0 and iters < max_iters:
+        temp = max(init_temp * np.exp(-exp_const * iters), min_temp)
+        iters += 1
+
+        for chain in range(chains):
+            if attempts[chain] >= max_attempts:
+                continue
+
+            i = np.random.randint(0, length)
+            a = states[chain, i]
+            if max_vals[chain] == 2:
+                b = 1 - a
+            else:
+                b = np.random.randint(0, max_vals[chain] - 1)
+                if b >= a:
+                    b += 1
+
+            delta_e = 0.0
+            for k in range(indptr[i], indptr[i + 1]):
+                if states[chain, indices[k]] == b:
+                    delta_e += data[k]
+                elif states[chain, indices[k]] == a:
+                    delta_e -= data[k]
+
+            if delta_e > 0 or np.random.random() < np.exp(delta_e / temp):
+                states[chain, i] = b
+                attempts[chain] = 0
+            else:
+                attempts[chain] += 1
+                if attempts[chain] >= max_attempts:
+                    running -= 1
+
+    return states
+
+
+if njit is not None:
+    _annealing_chains_kernel = njit(cache=True, nogil=True)(_annealing_chains_kernel)
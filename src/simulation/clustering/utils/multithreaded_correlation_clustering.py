@@ -9,11 +9,17 @@ from scipy.stats import spearmanr
 from networkx.algorithms.dag import transitive_closure
 import six
 sys.modules['sklearn.externals.six'] = six
-import mlrose
 import time
 from sklearn import metrics
 from scipy.optimize import linear_sum_assignment
 import multiprocessing as mp
+from multiprocessing import resource_tracker, shared_memory
+
+from simulation.clustering.utils import correlation_annealing
+
+# long-lived worker pool, lazily created on the first clustering and reused by all following ones (see shutdown_pool)
+_pool = None
+_pool_size = None
 
 
 def cluster_correlation_search(G, s=10, max_attempts=200, max_iters=5000, initial=[], split_flag=True, max_processor_count=mp.cpu_count()):
@@ -45,7 +51,7 @@ def cluster_correlation_search(G, s=10, max_attempts=200, max_iters=5000, initia
     edges_positive = set([(n2i[i], n2i[j], G[i][j]['weight']) for (i, j) in G.edges() if G[i][j]['weight'] >= 0.0])
     edges_negative = set([(n2i[i], n2i[j], G[i][j]['weight']) for (i, j) in G.edges() if G[i][j]['weight'] < 0.0])
 
-    Linear_loss = Loss('linear_loss', edges_positive=edges_positive, edges_negative=edges_negative)
+    Linear_loss = Loss('linear_loss', edges_positive=edges_positive, edges_negative=edges_negative, num_nodes=len(n2i))
     # conflict_loss = test_loss
 
     # Define initial state
@@ -61,14 +67,24 @@ def cluster_correlation_search(G, s=10, max_attempts=200, max_iters=5000, initia
     l2s = defaultdict(lambda: [])
     l2s[loss_init].append((init_state, len(classes)))
 
-    # Initialize multiprocessing.Pool()
     if max_processor_count == 0:
         max_processor_count = mp.cpu_count()
-    pool = mp.Pool(max_processor_count)
 
-    # `pool.apply`
-    solutions = pool.starmap(Linear_loss.optimize_simulated_annealing, [(n, classes, G.nodes(), init_state, max_attempts, max_iters) for n in range(2, s)])
-    pool.close()
+    if max_processor_count == 1:
+        # all chains in this process, without a pool
+        solutions = [_linear_loss_annealing_chains(Linear_loss.csr, (Linear_loss.edges_i, Linear_loss.edges_j, Linear_loss.weights), s, len(classes), init_state, max_attempts, max_iters)]
+    else:
+        # Reuse (or lazily create) the worker pool
+        pool = _get_pool(max_processor_count)
+
+        # workers attach to the edge arrays in shared memory, only their layout is pickled
+        block, layout = _share_arrays({'indptr': Linear_loss.csr[0], 'indices': Linear_loss.csr[1], 'data': Linear_loss.csr[2],
+                                       'edges_i': Linear_loss.edges_i, 'edges_j': Linear_loss.edges_j, 'weights': Linear_loss.weights})
+        try:
+            solutions = pool.starmap(_shared_linear_loss_annealing, [(block.name, layout, n, len(classes), init_state, max_attempts, max_iters) for n in range(2, s)])
+        finally:
+            block.close()
+            block.unlink()
 
     # Merge solutions
     for l2s_ in solutions:
@@ -102,13 +118,23 @@ class Loss(object):
     """
     """
     
-    def __init__(self, fitness_fn, edges_positive=None, edges_negative=None, edges_min=None, edges_max=None, signs=None):
+    def __init__(self, fitness_fn, edges_positive=None, edges_negative=None, edges_min=None, edges_max=None, signs=None, num_nodes=None):
  
         self.edges_positive = edges_positive
         self.edges_negative = edges_negative
         self.edges_min = edges_min
         self.edges_max = edges_max
         self.signs = signs
+
+        # signed edges as arrays (and CSR adjacency) for the linear loss and its annealing engine
+        if edges_positive is not None and edges_negative is not None:
+            edges = list(edges_positive) + list(edges_negative)
+            self.edges_i = np.array([i for (i,j,w) in edges], dtype=np.int64)
+            self.edges_j = np.array([j for (i,j,w) in edges], dtype=np.int64)
+            self.weights = np.array([w for (i,j,w) in edges], dtype=float)
+            if num_nodes is None:
+                num_nodes = int(max(self.edges_i.max(initial=-1), self.edges_j.max(initial=-1))) + 1
+            self.csr = correlation_annealing.build_signed_csr(num_nodes, self.edges_i, self.edges_j, self.weights)
         if fitness_fn == 'test_loss':
             self.fitness_fn = self.test_loss
         if fitness_fn == 'linear_loss':
@@ -125,10 +151,7 @@ class Loss(object):
         return 50.0
 
     def linear_loss(self, state):        
-        loss_pos = np.sum([w for (i,j,w) in self.edges_positive if state[i] != state[j]])
-        loss_neg = np.sum([abs(w) for (i,j,w) in self.edges_negative if state[i] == state[j]])        
-        loss = loss_pos + loss_neg        
-        return loss
+        return correlation_annealing.linear_loss(state, self.edges_i, self.edges_j, self.weights)
 
     def binary_loss(self, state, signs=['pos', 'neg']):        
         loss_pos = len([1 for (i,j,w) in self.edges_positive if state[i] != state[j]])
@@ -158,6 +181,11 @@ class Loss(object):
 
     def optimize_simulated_annealing(self, n, classes, nodes, init_state, max_attempts, max_iters):
 
+        if self.fitness_fn == self.linear_loss:
+            return self.optimize_linear_loss_annealing(n, classes, init_state, max_attempts, max_iters)
+
+        import mlrose
+
         # Important to reseed to have different seeds in different pool processes
         np.random.seed()
         
@@ -191,6 +219,126 @@ class Loss(object):
 
         return dict(l2s_)
 
+    def optimize_linear_loss_annealing(self, n, classes, init_state, max_attempts, max_iters):
+        """
+        Same search as optimize_simulated_annealing, with the O(degree) delta-loss engine instead of mlrose.
+        """
+        return _linear_loss_annealing(self.csr, (self.edges_i, self.edges_j, self.weights), n, len(classes), init_state, max_attempts, max_iters)
+
+
+def _linear_loss_annealing(csr, edges, n, num_classes, init_state, max_attempts, max_iters):
+
+    l2s_ = defaultdict(lambda: [])
+
+    # Important to reseed to have different seeds in different pool processes
+    np.random.seed()
+
+    # With initial state
+    max_val = max(n,num_classes)
+    best_state = correlation_annealing.simulated_annealing(*csr, max_val, init_state=init_state, max_attempts=max_attempts, max_iters=max_iters)
+    l2s_[correlation_annealing.linear_loss(best_state, *edges)].append((best_state,max_val))
+
+    # Important to reseed to have different seeds in different pool processes
+    np.random.seed()
+
+    # Repeat without initial state
+    max_val = n
+    best_state = correlation_annealing.simulated_annealing(*csr, max_val, max_attempts=max_attempts, max_iters=max_iters)
+    l2s_[correlation_annealing.linear_loss(best_state, *edges)].append((best_state,max_val))
+
+    return dict(l2s_)
+
+
+def _linear_loss_annealing_chains(csr, edges, s, num_classes, init_state, max_attempts, max_iters):
+    """
+    Runs the chains of _linear_loss_annealing for all n in range(2, s) at once.
+    """
+
+    l2s_ = defaultdict(lambda: [])
+
+    # With and without initial state per n
+    max_vals = [max_val for n in range(2, s) for max_val in (max(n,num_classes), n)]
+    init_states = [state for n in range(2, s) for state in (init_state, None)]
+
+    best_states = correlation_annealing.simulated_annealing_chains(*csr, max_vals, init_states, max_attempts=max_attempts, max_iters=max_iters)
+    for best_state, max_val in zip(best_states, max_vals):
+        l2s_[correlation_annealing.linear_loss(best_state, *edges)].append((best_state,max_val))
+
+    return dict(l2s_)
+
+
+def _shared_linear_loss_annealing(block_name, layout, n, num_classes, init_state, max_attempts, max_iters):
+    """
+    Runs _linear_loss_annealing in a pool worker on the edge arrays in the shared memory block.
+    """
+    block = shared_memory.SharedMemory(name=block_name)
+    try:
+        arrays = _attach_arrays(block, layout)
+        l2s_ = _linear_loss_annealing((arrays['indptr'], arrays['indices'], arrays['data']), (arrays['edges_i'], arrays['edges_j'], arrays['weights']),
+                                      n, num_classes, init_state, max_attempts, max_iters)
+        # views into the block have to be released, before it can be closed
+        del arrays
+    finally:
+        block.close()
+    return l2s_
+
+
+def _share_arrays(arrays):
+    """
+    Copies the arrays into one new shared memory block.
+    :param arrays: dict of arrays
+    :return block, layout: shared memory block (to be closed and unlinked by the caller), layout to attach to it
+    """
+    layout = []
+    offset = 0
+    for name, array in arrays.items():
+        layout.append((name, array.dtype.str, array.shape, offset))
+        # keep the arrays 8-byte aligned
+        offset += -(-array.nbytes // 8) * 8
+
+    block = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+    for (name, dtype, shape, offset) in layout:
+        np.ndarray(shape, dtype=dtype, buffer=block.buf, offset=offset)[...] = arrays[name]
+
+    return block, layout
+
+
+def _attach_arrays(block, layout):
+    return {name: np.ndarray(shape, dtype=dtype, buffer=block.buf, offset=offset) for (name, dtype, shape, offset) in layout}
+
+
+def _get_pool(processes):
+    """
+    Returns the long-lived worker pool, (re)created if it does not exist or has a different size.
+    """
+    global _pool, _pool_size
+
+    if _pool is not None and _pool_size != processes:
+        shutdown_pool()
+
+    if _pool is None:
+        # workers have to share the resource tracker of this process, else they would clean up the shared memory on their exit
+        resource_tracker.ensure_running()
+        _pool = mp.Pool(processes)
+        _pool_size = processes
+
+    return _pool
+
+
+def shutdown_pool():
+    """
+    Shuts down the worker pool, if it exists. The next clustering creates a new one.
+    """
+    global _pool, _pool_size
+
+    if _pool is None:
+        return
+
+    _pool.close()
+    _pool.join()
+    _pool = None
+    _pool_size = None
+
     
 def cluster_connected_components(G, is_non_value=lambda x: np.isnan(x)):
     """
@@ -13,11 +13,12 @@ from scipy.stats import spearmanr
 from networkx.algorithms.dag import transitive_closure
 import six
 sys.modules['sklearn.externals.six'] = six
-import mlrose
 import time
 from sklearn import metrics
 from scipy.optimize import linear_sum_assignment
 
+from simulation.clustering.utils import correlation_annealing
+
 
 def cluster_correlation_search(G, s=10, max_attempts=200, max_iters=5000, initial=[], split_flag=True):
     """
@@ -51,13 +52,15 @@ def cluster_correlation_search(G, s=10, max_attempts=200, max_iters=5000, initia
     edges_negative = set([(n2i[i], n2i[j], G[i][j]['weight'])
                          for (i, j) in G.edges() if G[i][j]['weight'] < 0.0])
 
+    # signed edges as arrays and CSR adjacency, each annealing move is evaluated in O(degree)
+    edges = list(edges_positive) + list(edges_negative)
+    edges_i = np.array([i for (i, j, w) in edges], dtype=np.int64)
+    edges_j = np.array([j for (i, j, w) in edges], dtype=np.int64)
+    weights = np.array([w for (i, j, w) in edges], dtype=float)
+    csr = correlation_annealing.build_signed_csr(len(n2i), edges_i, edges_j, weights)
+
     def conflict_loss(state):
-        loss_pos = np.sum(
-            [w for (i, j, w) in edges_positive if state[i] != state[j]])
-        loss_neg = np.sum(
-            [abs(w) for (i, j, w) in edges_negative if state[i] == state[j]])
-        loss = loss_pos + loss_neg
-        return loss
+        return correlation_annealing.linear_loss(state, edges_i, edges_j, weights)
 
     # Define initial state
     init_state = np.array([n2c[n] for n in sorted(n2c.keys())])
@@ -70,9 +73,6 @@ def cluster_correlation_search(G, s=10, max_attempts=200, max_iters=5000, initia
         stats['runtime'] = (end_time - start_time) / 60
         return classes, stats
 
-    # Initialize custom fitness function object
-    conflict_loss_cust = mlrose.CustomFitness(conflict_loss)
-
     l2s = defaultdict(lambda: [])
     l2s[loss_init].append((init_state, len(classes)))
 
@@ -80,28 +80,18 @@ def cluster_correlation_search(G, s=10, max_attempts=200, max_iters=5000, initia
 
         # With initial state
         max_val = max(n, len(classes))
-        problem = mlrose.DiscreteOpt(length=len(
-            G.nodes()), fitness_fn=conflict_loss_cust, maximize=False, max_val=max_val)
-        # print(n,max_val)
+        # Solve problem using simulated annealing (same schedule and moves as mlrose with ExpDecay)
+        best_state = correlation_annealing.simulated_annealing(
+            *csr, max_val, init_state=init_state, max_attempts=max_attempts, max_iters=max_iters)
 
-        # Define decay schedule
-        schedule = mlrose.ExpDecay()
-        # Solve problem using simulated annealing
-        best_state, best_fitness = mlrose.simulated_annealing(
-            problem, schedule=schedule, init_state=init_state, max_attempts=max_attempts, max_iters=max_iters)
-
-        l2s[best_fitness].append((best_state, max_val))
+        l2s[conflict_loss(best_state)].append((best_state, max_val))
 
         # Repeat without initial state
         max_val = n
-        problem = mlrose.DiscreteOpt(length=len(
-            G.nodes()), fitness_fn=conflict_loss_cust, maximize=False, max_val=max_val)
-
-        schedule = mlrose.ExpDecay()
-        best_state, best_fitness = mlrose.simulated_annealing(
-            problem, schedule=schedule, max_attempts=max_attempts, max_iters=max_iters)
+        best_state = correlation_annealing.simulated_annealing(
+            *csr, max_val, max_attempts=max_attempts, max_iters=max_iters)
 
-        l2s[best_fitness].append((best_state, max_val))
+        l2s[conflict_loss(best_state)].append((best_state, max_val))
 
     # print(l2s)
     _id = np.random.choice(range(len(l2s[min(l2s.keys())])))
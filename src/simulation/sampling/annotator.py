@@ -77,3 +77,51 @@ class Annotator():
         coefficient = np.random.choice([1, -1], p=[self.add_probability, 1 - self.add_probability])
 
         return np.min([np.max([value + coefficient * error_sample, self.minimum]), self.maximum])
+
+    def error_prone_sampling_batch(self, nodes_u: np.ndarray, nodes_v: np.ndarray, values: np.ndarray) -> np.ndarray:
+        """
+        Calculates the annotator-error for a batch of edges, with the same distribution as :error_prone_sampling: per edge.
+        All random numbers are drawn at once per effect.
+
+        Args:
+            :param nodes_u: first node of each edge
+            :param nodes_v: second node of each edge
+            :param values: true weight of each edge
+            :return np.ndarray: judgement of each edge
+        """
+        nodes_u = np.asarray(nodes_u, dtype=np.int64)
+        nodes_v = np.asarray(nodes_v, dtype=np.int64)
+        values = np.asarray(values, dtype=float)
+
+        judgements = np.zeros(len(values))
+        if len(values) == 0:
+            return judgements
+
+        # Zero annotation
+        annotated = np.random.random(len(values)) >= self.zero_probability
+
+        # nodes with high error
+        high_error = np.zeros(len(values), dtype=bool)
+        if len(self.high_error_nodes) > 0:
+            high_error_nodes = np.asarray(self.high_error_nodes, dtype=np.int64)
+            high_error_mask = np.zeros(max(high_error_nodes.max(), nodes_u.max(), nodes_v.max()) + 1, dtype=bool)
+            high_error_mask[high_error_nodes] = True
+            high_error = high_error_mask[nodes_u] | high_error_mask[nodes_v]
+
+        he_edges = np.flatnonzero(annotated & high_error)
+        if len(he_edges) > 0:
+            assert callable(self.he_distribution)
+            judgements[he_edges] = self._sample_errors(values[he_edges], self.he_distribution, self.he_param, self.he_minimum, self.he_max, self.he_add_prob)
+
+        edges = np.flatnonzero(annotated & ~high_error)
+        if len(edges) > 0:
+            assert callable(self.distribution)
+            judgements[edges] = self._sample_errors(values[edges], self.distribution, self.param, self.minimum, self.maximum, self.add_probability)
+
+        return judgements
+
+    def _sample_errors(self, values: np.ndarray, distribution, param: dict, minimum: float, maximum: float, add_probability: float) -> np.ndarray:
+        error_samples = distribution(size=len(values), **param)
+        coefficients = np.where(np.random.random(len(values)) < add_probability, 1, -1)
+
+        return np.clip(values + coefficients * error_samples, minimum, maximum)
@@ -108,13 +108,16 @@ class Sampling(RunnableStep):
         if len(edge_list) == 0:
             return
 
-        annotated_edge_list = []
-        for j in range(len(edge_list)):
-            for _ in range(self.annotations_per_edge):
-                annotator = np.random.choice(self.annotators)
-                annotated_edge_list.append((*edge_list[j][:2], annotator.error_prone_sampling(*edge_list[j])))
+        # each edge is annotated annotations_per_edge times in a row, by randomly assigned annotators
+        nodes_u, nodes_v, values = (np.repeat(np.asarray(column), self.annotations_per_edge) for column in zip(*edge_list))
+        assignment = np.random.randint(0, len(self.annotators), size=len(values))
 
-        annotated_graph.add_edges(annotated_edge_list)
+        judgements = np.empty(len(values))
+        for i, annotator in enumerate(self.annotators):
+            annotations = np.flatnonzero(assignment == i)
+            judgements[annotations] = annotator.error_prone_sampling_batch(nodes_u[annotations], nodes_v[annotations], values[annotations])
+
+        annotated_graph.add_edges_from_arrays(nodes_u, nodes_v, judgements)
 
     def _run_per_annotator(self, graph: BaseGraph, annotated_graph: BaseGraph) -> None:
         assert len(self.annotators) > 0
@@ -124,10 +127,8 @@ class Sampling(RunnableStep):
             if len(edge_list) == 0:
                 continue
 
-            for j in range(len(edge_list)):
-                edge_list[j] = (*edge_list[j][:2],
-                                annotator.error_prone_sampling(*edge_list[j]))
-            annotated_graph.add_edges(edge_list)
+            nodes_u, nodes_v, values = (np.asarray(column) for column in zip(*edge_list))
+            annotated_graph.add_edges_from_arrays(nodes_u, nodes_v, annotator.error_prone_sampling_batch(nodes_u, nodes_v, values))
 
     def _sample_edge_list(self, graph: BaseGraph, annotated_graph: BaseGraph) -> list:
         if self.complexity == 'simple':
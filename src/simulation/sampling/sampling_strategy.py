@@ -1,7 +1,7 @@
-import random
 import numpy as np
 
 from graphs.base_graph import BaseGraph
+from simulation.sampling.utils.indexed_set import IndexedSet
 
 """
 This module contains different simple sampling functions and can be extended to new ones.
@@ -17,10 +17,12 @@ def random_sampling(graph: BaseGraph, params: dict) -> list:
     As described in TACL paper 'Word Usage Graphs (WUGs):Measuring Changes in Patterns of Contextual Word Meaning'
 
     This implementation takes n radom edges (:sample_size:) from the TrueGraph and returns it.
+    All node pairs are drawn at once and their weights are fetched with one :get_edges: call.
 
     Args:
         :param trueGraph: TrueGraph to sample
         :param sample_size: number of edges to sample
+        :param seed: seed or numpy.random.Generator, randomly seeded if None (see :_generator:)
         :return sampled_edge_list: sampled edges with weights as [(u, v, w)...]
 
     """
@@ -29,17 +31,20 @@ def random_sampling(graph: BaseGraph, params: dict) -> list:
     sample_size = params.get('sample_size', None)
     assert sample_size is not None and type(sample_size) == int
 
-    sampled_edge_list = []
+    rng = _generator(params)
 
-    for _ in range(sample_size):
-        u, v = sorted(random.sample(graph.G.nodes(), 2))
+    nodes = np.fromiter(graph.get_nodes(), dtype=np.int64)
+    assert len(nodes) > 1
 
-        if u == v:
-            v = random.sample(list(graph.G.nodes() - {u}), 1)[0]
+    # v is drawn from all nodes except u, by shifting draws at or above u
+    u_index = rng.integers(0, len(nodes), size=sample_size)
+    v_index = rng.integers(0, len(nodes) - 1, size=sample_size)
+    v_index += v_index >= u_index
 
-        sampled_edge_list.append((u, v, graph.get_edge(u, v)))
+    u, v = np.minimum(nodes[u_index], nodes[v_index]), np.maximum(nodes[u_index], nodes[v_index])
+    weights = graph.get_edges(u, v)
 
-    return sampled_edge_list
+    return list(zip(u.tolist(), v.tolist(), weights.tolist()))
 
 
 def page_rank(graph: BaseGraph, params: dict) -> list:
@@ -55,6 +60,7 @@ def page_rank(graph: BaseGraph, params: dict) -> list:
         :param sample_size: number of edges to sample per annotator
         :param start: start node (can be None, int, or function)
         :param tp_coef: teleportation coefficient
+        :param seed: seed or numpy.random.Generator, randomly seeded if None (see :_generator:)
         :return sampled_edge_list: sampled edges with weights as [(u, v, w)...]
 
     """
@@ -65,6 +71,11 @@ def page_rank(graph: BaseGraph, params: dict) -> list:
     tp_coef = params.get('tp_coef', None)
     assert type(tp_coef) == float and 0 <= tp_coef <= 1
 
+    rng = _generator(params)
+
+    nodes = np.fromiter(graph.get_nodes(), dtype=np.int64)
+    assert len(nodes) > 1
+
     last_node = params.get('start', None)
     if callable(last_node):
         last_node = last_node()
@@ -72,25 +83,35 @@ def page_rank(graph: BaseGraph, params: dict) -> list:
     assert type(last_node) == int or last_node is None
 
     if last_node is None:
-        last_node = random.sample(graph.G.nodes(), 1)[0]
+        last_index = int(rng.integers(0, len(nodes)))
+    else:
+        last_index = int(np.flatnonzero(nodes == last_node)[0])
     # ===END Guard===
 
-    sampled_edge_list = []
-
-    for _ in range(sample_size):
+    # ===Draw Phase===
+    # all random decisions are drawn up front, the walk itself only does index arithmetic per step
+    teleports = (rng.random(sample_size) < tp_coef).tolist()
+    teleport_indices = rng.integers(0, len(nodes), size=sample_size).tolist()
+    # next node among all nodes but the current one, by shifting draws at or above its index
+    next_offsets = rng.integers(0, len(nodes) - 1, size=sample_size).tolist()
+    # ===Draw Phase End===
+
+    # ===Walk Phase===
+    u_indices = []
+    v_indices = []
+    for teleport, teleport_index, next_offset in zip(teleports, teleport_indices, next_offsets):
         # choose next start and following node
-        last_node = np.random.choice([last_node, random.sample(graph.G.nodes(), 1)[0]], p=[1 - tp_coef, tp_coef])
-        next_node = random.sample(list(graph.G.nodes() - {last_node}), 1)[0]
+        if teleport:
+            last_index = teleport_index
+        next_index = next_offset + (next_offset >= last_index)
 
-        if last_node == next_node:
-            print('WTF?')
-            print(last_node in list(graph.G.nodes() - {last_node}))
-            exit()
+        u_indices.append(last_index)
+        v_indices.append(next_index)
+        last_index = next_index
+    # ===Walk Phase End===
 
-        sampled_edge_list.append((last_node, next_node, graph.get_edge(last_node, next_node)))
-        last_node = next_node
-
-    return sampled_edge_list
+    u_nodes, v_nodes = nodes[u_indices], nodes[v_indices]
+    return list(zip(u_nodes.tolist(), v_nodes.tolist(), graph.get_edges(u_nodes, v_nodes).tolist()))
 
 
 def modified_randomwalk(graph: BaseGraph, params: dict) -> list:
@@ -100,7 +121,8 @@ def modified_randomwalk(graph: BaseGraph, params: dict) -> list:
         It is assumed, that the sample size is divisble by two!
     Args:
         graph (BaseGraph): Graph, on which the walk should be performed
-        params (dict): Contains the parameters for sample_size, start_node, function that returns nodes of annotated graph
+        params (dict): Contains the parameters for sample_size, start_node, function that returns nodes of annotated graph,
+            seed (seed or numpy.random.Generator, randomly seeded if None, see _generator)
 
     Returns:
         list: edge list containing the the found edges
@@ -115,31 +137,36 @@ def modified_randomwalk(graph: BaseGraph, params: dict) -> list:
 
     assert type(last_node) == int or last_node is None
 
+    rng = _generator(params)
+
     if last_node is None:
-        last_node = random.sample(graph.G.nodes(), 1)[0]
+        nodes = list(graph.get_nodes())
+        last_node = nodes[int(rng.integers(0, len(nodes)))]
 
     contained_set = params.get('conntained_func', None)
     assert callable(contained_set)
-    contained_set = set(contained_set()).union({last_node})
-    not_contained_set = set(graph.G.nodes()).difference(contained_set)
+    contained_set = IndexedSet(contained_set())
+    contained_set.add(last_node)
+    not_contained_set = IndexedSet(node for node in graph.get_nodes() if node not in contained_set)
 
     sampled_edge_list = []
 
-    for _ in range(sample_size):
+    # the uniform draws of both choices per iteration are drawn up front
+    for unknown_draw, known_draw in rng.random((sample_size, 2)).tolist():
         # Explore uknown set, if possible
         if len(not_contained_set) > 0:
-            unknown_node = random.sample(not_contained_set, 1)[0]
+            unknown_node = not_contained_set.choice(unknown_draw)
         else:
-            unknown_node = random.sample(contained_set.difference({last_node}), 1)[0]
+            unknown_node = contained_set.choice_excluding(last_node, unknown_draw)
         sampled_edge_list.append((last_node, unknown_node, graph.get_edge(last_node, unknown_node)))
 
         # return back to known set
-        last_node = random.sample(contained_set.difference({unknown_node}), 1)[0]
+        last_node = contained_set.choice_excluding(unknown_node, known_draw)
         sampled_edge_list.append((unknown_node, last_node, graph.get_edge(unknown_node, last_node)))
 
         # add uknown node to known set
-        not_contained_set = not_contained_set.difference({unknown_node})
-        contained_set = contained_set.union({unknown_node})
+        not_contained_set.discard(unknown_node)
+        contained_set.add(unknown_node)
 
     return sampled_edge_list
 
@@ -153,7 +180,8 @@ def multiple_edges_randomwalk(graph: BaseGraph, params: dict) -> list:
 
     Args:
         graph (BaseGraph): Graph to sample from
-        params (dict): dict containing (rounds,  sample_per_node, start)
+        params (dict): dict containing (rounds,  sample_per_node, start, seed)
+            seed is a seed or numpy.random.Generator, randomly seeded if None (see _generator)
 
     Returns:
         list: sampled edges with weights [[u, v, w], ...]
@@ -165,6 +193,11 @@ def multiple_edges_randomwalk(graph: BaseGraph, params: dict) -> list:
     sample_per_node = params.get('sample_per_node', None)
     assert type(sample_per_node) == int and sample_per_node > 0
 
+    rng = _generator(params)
+
+    nodes = np.fromiter(graph.get_nodes(), dtype=np.int64)
+    assert sample_per_node < len(nodes)
+
     last_node = params.get('start', None)
     if callable(last_node):
         last_node = last_node()
@@ -172,14 +205,39 @@ def multiple_edges_randomwalk(graph: BaseGraph, params: dict) -> list:
     assert type(last_node) == int or last_node is None
 
     if last_node is None:
-        last_node = random.sample(graph.G.nodes(), 1)[0]
+        last_index = int(rng.integers(0, len(nodes)))
+    else:
+        last_index = int(np.flatnonzero(nodes == last_node)[0])
     # ===END Guard===
 
-    sampled_edge_list = []
+    u_indices = np.empty((rounds, sample_per_node), dtype=np.int64)
+    v_indices = np.empty((rounds, sample_per_node), dtype=np.int64)
 
-    for _ in range(rounds):
-        # choose next start and following node
-        sampled_edge_list.extend([[last_node, next_node, graph.get_edge(last_node, next_node)] for next_node in random.sample(list(graph.G.nodes() - {last_node}), sample_per_node)])
-        last_node = sampled_edge_list[-1][1]
+    for _round in range(rounds):
+        # choose the following nodes among all nodes but the current one, by shifting draws at or above its index
+        next_indices = v_indices[_round]
+        next_indices[:] = rng.choice(len(nodes) - 1, size=sample_per_node, replace=False)
+        next_indices += next_indices >= last_index
 
-    return sampled_edge_list
+        u_indices[_round] = last_index
+        last_index = int(next_indices[-1])
+
+    u_nodes, v_nodes = nodes[u_indices.ravel()], nodes[v_indices.ravel()]
+    return [list(edge) for edge in zip(u_nodes.tolist(), v_nodes.tolist(), graph.get_edges(u_nodes, v_nodes).tolist())]
+
+
+# util functions
+def _generator(params: dict) -> np.random.Generator:
+    """
+    Returns the numpy.random.Generator of the sampling parameters.
+    A seed (or None) is replaced by its Generator in :params:, on the first call,
+        thus the following rounds, which are called with the same params, continue the same random stream instead of repeating it.
+
+    Args:
+        :param params: sampling parameters, with the optional key seed
+        :return np.random.Generator: generator
+    """
+    rng = params.get('seed', None)
+    if not isinstance(rng, np.random.Generator):
+        rng = params['seed'] = np.random.default_rng(rng)
+    return rng
@@ -33,9 +33,9 @@ def _z_sampling_round(sample_graph: BaseGraph, percentage_nodes: float, percenta
     number_nodes = percentage_nodes if num_flag else round(sample_graph.get_number_nodes() * percentage_nodes)
 
     try:
-        nodes = np.random.choice(sample_graph.G.nodes(), number_nodes, replace=False)
+        nodes = np.random.choice(list(sample_graph.get_nodes()), number_nodes, replace=False)
     except ValueError:
-        nodes = sample_graph.G.nodes()
+        nodes = list(sample_graph.get_nodes())
 
     max_edges = percentage_edges if num_flag else len(nodes) * (len(nodes) - 1) * 0.5 * percentage_edges
 
@@ -45,24 +45,20 @@ def _z_sampling_round(sample_graph: BaseGraph, percentage_nodes: float, percenta
 def _n_sampling_round(sample_graph: BaseGraph, annotated_graph: BaseGraph, min_size_mc: int, percentage_nodes: float, percentage_edges: float, num_flag: bool) -> list:
     # Nodes not in cluster size >= min_size_mc
     nodes = [node for k, v in annotated_graph.get_community_nodes().items() if len(v) < min_size_mc for node in v]
-    multi_clusters = [v for k, v in annotated_graph.get_community_nodes().items() if len(v) >= min_size_mc]
+    multi_clusters = {k: v for k, v in annotated_graph.get_community_nodes().items() if len(v) >= min_size_mc}
 
     # Find nodes to be used in the sample round
     combination_nodes = []
     exploration_nodes = []
 
     for node in nodes:
-        cn_flag = False
-        for cluster in multi_clusters:
-            cn_flag |= not _check_node_cluster_con(annotated_graph, node, cluster)
-
-        if cn_flag:
+        if not all(annotated_graph.is_node_connected_to_cluster(node, community) for community in multi_clusters):
             combination_nodes.append(node)
         else:
             exploration_nodes.append(node)
 
     # add new nodes to combination phase
-    not_added_nodes = list(set(sample_graph.G.nodes()) - set(annotated_graph.G.nodes()))
+    not_added_nodes = list(set(sample_graph.get_nodes()) - set(annotated_graph.get_nodes()))
     num_new_nodes_add = percentage_nodes if num_flag else round(sample_graph.get_number_nodes() * percentage_nodes)
 
     try:
@@ -81,41 +77,38 @@ def _n_sampling_round(sample_graph: BaseGraph, annotated_graph: BaseGraph, min_s
     return sampled_edge_list
 
 
-def _combination_phase(sample_graph: BaseGraph, annotated_graph: BaseGraph, nodes: list, multi_clusters: list) -> list:
+def _combination_phase(sample_graph: BaseGraph, annotated_graph: BaseGraph, nodes: list, multi_clusters: dict) -> list:
     if len(nodes) == 0:
         return []
 
     sampled_edge_list = []
 
     for node in nodes:
-        for cluster in multi_clusters:
-            if not _check_node_cluster_con(annotated_graph, node, cluster):
+        for community, cluster in multi_clusters.items():
+            if not annotated_graph.is_node_connected_to_cluster(node, community):
                 connection = random.choice(cluster)
                 sampled_edge_list.append((node, connection, sample_graph.get_edge(node, connection)))
 
     return sampled_edge_list
 
 
-def _check_node_cluster_con(graph: BaseGraph, node: int, cluster: list) -> bool:
-    for c_node in cluster:
-        u, v = sorted([node, c_node])
-        if graph.get_edge(u, v) is not None:
-            return True
-
-    return False
-
-
 def _exploration_phase(sample_graph: BaseGraph, nodes: list, max_edges: float) -> list:
     # RandomWalk till percentage edges found
     if len(nodes) == 0 or len(nodes) == 1:
         return []
 
-    sampled_edge_list = []
-    last_node = random.choice(nodes)
+    nodes = np.asarray(nodes, dtype=np.int64)
+    steps = max(int(np.ceil(max_edges)), 0)
 
-    while len(sampled_edge_list) < max_edges:
-        next_node = random.choice(np.delete(np.array(nodes), np.where(np.array(nodes) == last_node)))
-        sampled_edge_list.append((last_node, next_node, sample_graph.get_edge(last_node, next_node)))
-        last_node = next_node
+    # next node among all nodes but the last one, by shifting draws at or above its index
+    next_offsets = np.random.randint(0, len(nodes) - 1, size=steps).tolist()
+    last_index = np.random.randint(0, len(nodes))
 
-    return sampled_edge_list
+    indices = np.empty(steps + 1, dtype=np.int64)
+    indices[0] = last_index
+    for step, next_offset in enumerate(next_offsets):
+        last_index = next_offset + (next_offset >= last_index)
+        indices[step + 1] = last_index
+
+    u_nodes, v_nodes = nodes[indices[:-1]], nodes[indices[1:]]
+    return list(zip(u_nodes.tolist(), v_nodes.tolist(), sample_graph.get_edges(u_nodes, v_nodes).tolist()))
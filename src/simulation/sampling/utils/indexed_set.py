@@ -0,0 +1,74 @@
+class IndexedSet:
+
+    def __init__(self, elements=()):
+        """
+        Set of hashable elements, which supports O(1) insertion, removal and uniform random choice.
+        Elements are kept in a list with a position map, removal swaps the last element into the freed position.
+        Random choices are made from uniform draws in [0, 1) of the caller (e.g. numpy.random.Generator.random),
+            thus the set does not hold a random generator of its own.
+
+        Args:
+            :param elements: initial elements, duplicates are ignored
+        """
+        self._elements = []
+        self._positions = {}
+
+        for element in elements:
+            self.add(element)
+
+    def add(self, element) -> None:
+        if element in self._positions:
+            return
+        self._positions[element] = len(self._elements)
+        self._elements.append(element)
+
+    def remove(self, element) -> None:
+        position = self._positions.pop(element)
+        last = self._elements.pop()
+
+        # swap the last element into the freed position
+        if position < len(self._elements):
+            self._elements[position] = last
+            self._positions[last] = position
+
+    def discard(self, element) -> None:
+        if element in self._positions:
+            self.remove(element)
+
+    def choice(self, uniform: float):
+        """
+        Returns a uniformly chosen element.
+
+        Args:
+            :param uniform: uniform draw in [0, 1)
+        """
+        if len(self._elements) == 0:
+            raise IndexError('Cannot choose from an empty set')
+        return self._elements[int(uniform * len(self._elements))]
+
+    def choice_excluding(self, excluded, uniform: float):
+        """
+        Returns a uniformly chosen element other than :excluded:, without building the set difference.
+
+        Args:
+            :param excluded: element not to choose, may not be contained
+            :param uniform: uniform draw in [0, 1)
+        """
+        position = self._positions.get(excluded, None)
+        if position is None:
+            return self.choice(uniform)
+
+        if len(self._elements) < 2:
+            raise IndexError('Cannot choose from an empty set')
+        # draw from all other positions, by shifting draws at or above the excluded position
+        index = int(uniform * (len(self._elements) - 1))
+        return self._elements[index + (index >= position)]
+
+    def __contains__(self, element) -> bool:
+        return element in self._positions
+
+    def __len__(self) -> int:
+        return len(self._elements)
+
+    def __iter__(self):
+        return iter(self._elements)
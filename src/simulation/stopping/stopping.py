@@ -1,5 +1,3 @@
-from copy import deepcopy
-
 from graphs.base_graph import BaseGraph
 from simulation.runnable_step import RunnableStep
 
@@ -47,7 +45,7 @@ class Stopping(RunnableStep):
 
         assert callable(self.function) and self.params is not None
 
-        _annotated_graph = deepcopy(annotated_graph)
+        _annotated_graph = annotated_graph.snapshot()
 
         if len(self.preprocessing_steps) > 0:
             for step in self.preprocessing_steps:
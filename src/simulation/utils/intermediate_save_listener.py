@@ -1,8 +1,7 @@
 import os
-import pickle
 
-from copy import deepcopy
 from graphs.base_graph import BaseGraph
+from graphs.utils.serialization import save_graph
 from simulation.runnable_step import RunnableStep
 from visualization.graph_visualization import draw_graph_gt as draw
 
@@ -27,6 +26,7 @@ class IntermediateSaveListener(RunnableStep):
 
         self.preprocessing_steps: list[RunnableStep] = []
         self.plot_save = False
+        self.compress = False
         self.skip_oz = False
 
     def add_listener(self, checkpoints: list, path: str, id_prefix: str, function_to_listen):
@@ -61,21 +61,23 @@ class IntermediateSaveListener(RunnableStep):
         self.plot_save = True
         return self
 
+    def save_compressed(self):
+        self.compress = True
+        return self
+
     def skip_only_zeros(self):
         self.skip_oz = True
         return self
 
     def tail_write_function(self):
         for gaph, graph_path, draw_path in self.graphs:
-            with open(graph_path, 'wb') as file:
-                pickle.dump(gaph, file)
-            file.close()
+            save_graph(gaph, graph_path, compress=self.compress, overwrite=True)
 
             if self.plot_save:
                 draw(gaph, draw_path)
 
     def run(self, graph: BaseGraph, annotated_graph: BaseGraph) -> None:
-        if self.skip_oz and len(annotated_graph.G.edges()) == 0:
+        if self.skip_oz and annotated_graph.get_number_edges() == 0:
             print('No edges added, skipping')
             return
 
@@ -86,7 +88,7 @@ class IntermediateSaveListener(RunnableStep):
         if not self.checker(self.function_to_listen(), self.checkpoints[self.checkpoint_index]):
             return
 
-        _annotated_graph = deepcopy(annotated_graph)
+        _annotated_graph = annotated_graph.snapshot()
 
         if len(self.preprocessing_steps) > 0:
             for step in self.preprocessing_steps:
@@ -102,9 +104,8 @@ class IntermediateSaveListener(RunnableStep):
             self.graphs.append((_annotated_graph, graph_path, draw_path))
 
         else:
-            with open('{}/{}{}.graph'.format(self.path, self.id_prefix, self.checkpoints[self.checkpoint_index]), 'wb') as file:
-                pickle.dump(_annotated_graph, file)
-            file.close()
+            save_graph(_annotated_graph, '{}/{}{}.graph'.format(self.path, self.id_prefix, self.checkpoints[self.checkpoint_index]),
+                       compress=self.compress, overwrite=True)
 
             if self.plot_save:
                 draw(_annotated_graph, '{}/{}{}.png'.format(self.path, self.id_prefix, self.checkpoints[self.checkpoint_index]))
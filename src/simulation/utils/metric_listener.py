@@ -1,8 +1,6 @@
 import os
 import numpy as np
 
-from copy import deepcopy
-
 from simulation.runnable_step import RunnableStep
 from graphs.base_graph import BaseGraph
 
@@ -80,7 +78,7 @@ class MetricListener(RunnableStep):
         self._write_stats(self.stats_list)
 
     def run(self, graph: BaseGraph, annotated_graph: BaseGraph) -> None:
-        if self.skip_oz and len(annotated_graph.G.edges()) == 0:
+        if self.skip_oz and annotated_graph.get_number_edges() == 0:
             print('No edges added, skipping')
             return
 
@@ -90,7 +88,7 @@ class MetricListener(RunnableStep):
         if not self.checkpoints[self.checkpoint_index] <= self.function_to_listen():
             return
 
-        _annotated_graph = deepcopy(annotated_graph)
+        _annotated_graph = annotated_graph.snapshot()
 
         if len(self.preprocessing_steps) > 0:
             for step in self.preprocessing_steps:
@@ -139,10 +137,10 @@ class MetricListener(RunnableStep):
         graph_stats = []
 
         # add num edges
-        graph_stats.append(len(graph.G.nodes()))
+        graph_stats.append(graph.get_number_nodes())
 
         # add num edges
-        graph_stats.append(len(graph.G.edges()))
+        graph_stats.append(graph.get_number_edges())
 
         # add num edges
         graph_stats.append(graph.get_num_added_edges())
@@ -0,0 +1,42 @@
+import multiprocessing
+import pytest
+import numpy as np
+
+from multiprocessing import shared_memory
+
+from graphs.simulation_graph import SimulationGraph
+from graphs.utils.distribution import Binomial
+
+
+def _worker_edges(graph: SimulationGraph) -> (np.ndarray, bool):
+    attached = graph._shared_memory is not None
+    edges = graph.get_edges(np.arange(graph.get_number_nodes()), np.arange(graph.get_number_nodes())[::-1])
+    graph.release_adjacency_matrix()
+    return edges, attached
+
+
+def test_share_adjacency_matrix_workers_release():
+    graph = SimulationGraph([20, 15, 10], distribution=Binomial(3, 0.9, 3), lazy=True)
+    adjacency_matrix = graph.adjacency_matrix.copy()
+    nodes = np.arange(graph.get_number_nodes())
+
+    block = graph.share_adjacency_matrix()
+    assert graph.share_adjacency_matrix() is block
+    np.testing.assert_array_equal(graph.adjacency_matrix, adjacency_matrix)
+
+    with multiprocessing.get_context('spawn').Pool(2) as pool:
+        results = pool.map(_worker_edges, [graph] * 4)
+
+    for edges, attached in results:
+        assert attached
+        np.testing.assert_array_equal(edges, adjacency_matrix[nodes, nodes[::-1]])
+
+    graph.release_adjacency_matrix()
+    assert graph._shared_memory is None
+    np.testing.assert_array_equal(graph.adjacency_matrix, adjacency_matrix)
+    assert graph.get_edge(0, 5) == adjacency_matrix[0, 5]
+
+    # released twice is a no-op, the block is gone
+    graph.release_adjacency_matrix()
+    with pytest.raises(FileNotFoundError):
+        shared_memory.SharedMemory(name=block.name)
@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+
+from simulation.clustering.utils import correlation_annealing
+
+
+@pytest.fixture
+def planted_graph():
+    # 4 planted clusters, positive edges inside and negative edges between them, 10% of the signs flipped
+    rng = np.random.default_rng(0)
+    labels = np.repeat(np.arange(4), 30)
+    edges_i, edges_j = np.triu_indices(len(labels), 1)
+    kept = rng.random(len(edges_i)) < 0.3
+    edges_i, edges_j = edges_i[kept], edges_j[kept]
+
+    weights = np.where(labels[edges_i] == labels[edges_j], 1.0, -1.0) * rng.uniform(0.5, 1.5, len(edges_i))
+    weights[rng.random(len(weights)) < 0.1] *= -1
+    return len(labels), edges_i, edges_j, weights
+
+
+@pytest.mark.parametrize('jit', [False, True])
+def test_chains_match_per_chain_losses(planted_graph, jit):
+    num_nodes, edges_i, edges_j, weights = planted_graph
+    csr = correlation_annealing.build_signed_csr(num_nodes, edges_i, edges_j, weights)
+    max_vals = [max_val for max_val in range(2, 8) for _ in range(2)]
+
+    np.random.seed(1)
+    init_states = [np.random.randint(0, max_val, num_nodes) for max_val in max_vals]
+
+    np.random.seed(2)
+    states = correlation_annealing.simulated_annealing_chains(*csr, max_vals, [None] * len(max_vals), max_attempts=100, jit=jit)
+    assert states.shape == (len(max_vals), num_nodes)
+    assert all(0 <= state.min() and state.max() < max_val for state, max_val in zip(states, max_vals))
+
+    np.random.seed(2)
+    per_chain = [correlation_annealing.simulated_annealing(*csr, max_val, None, max_attempts=100, jit=False) for max_val in max_vals]
+
+    chain_losses = [correlation_annealing.linear_loss(state, edges_i, edges_j, weights) for state in states]
+    per_chain_losses = [correlation_annealing.linear_loss(state, edges_i, edges_j, weights) for state in per_chain]
+    init_losses = [correlation_annealing.linear_loss(state, edges_i, edges_j, weights) for state in init_states]
+
+    # both anneal to a comparable loss, far below the one of random states
+    assert np.mean(chain_losses) == pytest.approx(np.mean(per_chain_losses), rel=0.05)
+    assert np.mean(chain_losses) < 0.5 * np.mean(init_losses)